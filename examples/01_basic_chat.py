@@ -2,22 +2,27 @@
 示例 1: 基础对话
 使用 SimpleAgent 进行简单的对话交互
 """
-import os
-from dotenv import load_dotenv
-from rungpt import SimpleAgent, Thread
+def main():
+    # 延迟导入:避免在模块导入阶段就加载整个框架及其依赖
+    from dotenv import load_dotenv
+    from rungpt import SimpleAgent, Thread, ResponseCache
+    from rungpt.utils import truncate
 
-# 加载环境变量
-load_dotenv()
+    # 加载环境变量
+    load_dotenv()
 
-def main():
     print("=== RunGPT 示例 1: 基础对话 ===\n")
     
     # 创建 SimpleAgent
     # 可以使用 "gpt-4o-mini" 或 "openai:gpt-4o-mini" 格式
+    # 响应缓存: 相同 Prompt 的重复调用直接命中缓存,不再请求 API
+    cache = ResponseCache()
+
     agent = SimpleAgent(
         model="gpt-4o-mini",
         verbose=True,  # 打印详细信息
-        temperature=0.7
+        temperature=0.7,
+        cache=cache
     )
     
     # 创建对话线程
@@ -39,8 +44,7 @@ def main():
     context = thread.get_context()
     for i, msg in enumerate(context, 1):
         role = msg['role']
-        content = msg['content'][:100] + "..." if len(msg['content']) > 100 else msg['content']
-        print(f"{i}. [{role}]: {content}")
+        print(f"{i}. [{role}]: {truncate(msg['content'], 100)}")
     
     # 获取执行追踪
     print("\n--- 执行追踪 ---")
@@ -51,6 +55,10 @@ def main():
         print(f"执行时间: {trace['duration_seconds']:.2f}秒")
         print(f"步骤数: {len(trace['steps'])}")
 
+    # 查看缓存统计
+    print(f"\n--- 缓存统计 ---")
+    print(cache.get_stats())
+
 if __name__ == "__main__":
     main()
 
@@ -8,13 +8,10 @@ import sys
 # 将项目根目录添加到 sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from dotenv import load_dotenv
-from rungpt import SimpleAgent, Thread, ToolRegistry
+# 模块级只导入工具定义所需的符号,Agent 等重量级符号在 main() 中延迟导入
+from rungpt import ToolRegistry
 from rungpt.tools import ToolResult
 
-# 加载环境变量
-load_dotenv()
-
 # 实例化工具注册表
 registry = ToolRegistry()
 
@@ -67,43 +64,42 @@ def search_info(query: str, limit: int = 5) -> ToolResult:
     return ToolResult.ok(result)
 
 def main():
+    from dotenv import load_dotenv
+    from rungpt import SimpleAgent, Thread
+
+    # 加载环境变量
+    load_dotenv()
+
     print("=== RunGPT 示例 2: 工具调用 ===\n")
     
     # 查看已注册的工具
     print("--- 已注册的工具 ---")
-    print("--- 已注册的工具 ---")
-    all_tools = registry.list_tools()
-    for name in all_tools:
-        tool = registry.get_tool(name)
-        print(f"- {tool.name}: {tool.description}")
+    for name, tool in registry.iter_tools():
+        print(f"- {name}: {tool.description}")
     
     # 创建带工具的 Agent
     agent = SimpleAgent(
         system_prompt="你是一个有用的助手。",
         model="gpt-4o-mini",
         tools=registry,
-        verbose=True
+        verbose=False  # 并发执行时关闭详细输出,避免多线程打印交错
     )
     
-    # 创建对话线程
-    thread = Thread()
-    
-    # 测试天气查询工具
-    print("\n--- 测试 1: 查询天气 ---")
-    response = agent.run("帮我查一下北京的天气", thread)
-    print(f"\n回答: {response}\n")
-    
-    # 测试计算工具
-    print("\n--- 测试 2: 计算 ---")
-    thread_calc = Thread()
-    response = agent.run("计算 123 + 456 等于多少", thread_calc)
-    print(f"\n回答: {response}\n")
-    
-    # 测试搜索工具
-    print("\n--- 测试 3: 搜索 ---")
-    thread_search = Thread()
-    response = agent.run("搜索人工智能相关信息，返回 3 条结果", thread_search)
-    print(f"\n回答: {response}\n")
+    # 三个任务相互独立,使用 run_batch 并发执行
+    # 串行执行需要 3 次完整网络往返,并发后总耗时约等于最慢的一次
+    tasks = [
+        "帮我查一下北京的天气",
+        "计算 123 + 456 等于多少",
+        "搜索人工智能相关信息，返回 3 条结果",
+    ]
+    threads = [Thread() for _ in tasks]
+
+    print("\n--- 并发执行 3 个独立任务 ---")
+    responses = agent.run_batch(tasks, threads)
+
+    for i, (task, response) in enumerate(zip(tasks, responses), 1):
+        print(f"\n--- 任务 {i}: {task} ---")
+        print(f"回答: {response}\n")
     
     # 手动调用工具（不通过 Agent）
     print("\n--- 手动调用工具 ---")
@@ -8,13 +8,10 @@ import sys
 # 将项目根目录添加到 sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from dotenv import load_dotenv
-from rungpt import ReActAgent, Thread, ToolRegistry
+# 模块级只导入工具定义所需的符号,Agent 等重量级符号在 main() 中延迟导入
+from rungpt import ToolRegistry
 from rungpt.tools import ToolResult
 
-# 加载环境变量
-load_dotenv()
-
 # 实例化工具注册表
 registry = ToolRegistry()
 
@@ -56,6 +53,36 @@ def calculate_investment(amount: float, price: float) -> ToolResult:
     result = f"可购买 {shares} 股，剩余 ${remaining:.2f}"
     return ToolResult.ok(result)
 
+@registry.tool
+def calculate_investment_bulk(amount: float, prices: str) -> ToolResult:
+    """
+    批量计算多个价格情景下可购买的股票数量
+
+    一次工具调用完成整批计算,避免逐情景调用工具
+    (每次调用都要经历一轮 LLM 推理 + 工具分发)。
+
+    Args:
+        amount: 投资金额
+        prices: 逗号分隔的价格列表，如 "175.5, 242.8, 138.2"
+
+    Returns:
+        ToolResult 对象
+    """
+    try:
+        price_list = [float(p) for p in prices.split(",") if p.strip()]
+    except ValueError:
+        return ToolResult.fail(f"无法解析价格列表: {prices}")
+
+    if not price_list:
+        return ToolResult.fail("价格列表为空")
+
+    lines = []
+    for price in price_list:
+        shares = int(amount / price)
+        remaining = amount - shares * price
+        lines.append(f"价格 ${price:.2f}: 可购买 {shares} 股，剩余 ${remaining:.2f}")
+    return ToolResult.ok("\n".join(lines))
+
 @registry.tool
 def analyze_trend(symbol: str, days: int = 30) -> ToolResult:
     """
@@ -73,6 +100,13 @@ def analyze_trend(symbol: str, days: int = 30) -> ToolResult:
     return ToolResult.ok(result)
 
 def main():
+    from dotenv import load_dotenv
+    from rungpt import ReActAgent, Thread
+    from rungpt.utils import truncate
+
+    # 加载环境变量
+    load_dotenv()
+
     print("=== RunGPT 示例 3: ReAct 推理 ===\n")
     
     # 创建 ReActAgent
@@ -80,6 +114,7 @@ def main():
         system_prompt="你是一个智能助手，可以使用工具帮助用户解决问题。",
         model="gpt-4o-mini",
         tools=registry,
+        tool_concurrency=4,  # 单步内最多并发执行 4 个独立工具调用
         max_steps=5,  # 最大推理步数
         verbose=True,
         temperature=0.7,
@@ -117,12 +152,12 @@ def main():
         for i, step in enumerate(trace['steps'], 1):
             step_type = step['type']
             if step_type == "thought":
-                print(f"{i}. [思考] {step['data'].get('content', '')[:80]}...")
+                print(f"{i}. [思考] {truncate(step['data'].get('content', ''), 80)}")
             elif step_type == "action":
                 action = step['data']
                 print(f"{i}. [行动] {action.get('tool', 'unknown')}({action.get('input', {})})")
             elif step_type == "observation":
-                print(f"{i}. [观察] {step['data'].get('result', '')[:80]}...")
+                print(f"{i}. [观察] {truncate(step['data'].get('result', ''), 80)}")
 
 if __name__ == "__main__":
     main()
@@ -2,14 +2,15 @@
 示例 4: 记忆管理
 演示如何使用 MemoryManager 进行跨对话记忆管理
 """
-import os
-from dotenv import load_dotenv
-from rungpt import SimpleAgent, Thread, MemoryManager
+def main():
+    # 延迟导入:避免在模块导入阶段就加载整个框架及其依赖
+    from dotenv import load_dotenv
+    from rungpt import SimpleAgent, Thread, MemoryManager
+    from rungpt.utils import truncate
 
-# 加载环境变量
-load_dotenv()
+    # 加载环境变量
+    load_dotenv()
 
-def main():
     print("=== RunGPT 示例 5: 记忆管理 ===\n")
     
     # 创建记忆管理器
@@ -29,15 +30,18 @@ def main():
     print("--- 场景 1: 用户信息记忆 ---\n")
     
     # 存储用户信息
-    memory.store("user_name", "李明", category="user_info")
-    memory.store("user_age", "25", category="user_info")
-    memory.store("user_interest", "机器学习、Python编程", category="user_info")
+    memory.store_many([
+        ("user_name", "李明"),
+        ("user_age", "25"),
+        ("user_interest", "机器学习、Python编程"),
+    ], category="user_info")
     
     print("已存储用户信息到记忆中\n")
     
     # 第一次对话
+    # 用户信息已存入 memory,会作为独立的上下文消息自动注入
+    # (不写入系统提示词,保持系统前缀稳定以便命中服务端 Prompt 缓存)
     thread1 = Thread()
-    thread1.add_system("用户名：李明，年龄：25岁，兴趣：机器学习、Python编程")
     response = agent.run("你好，我想学习新技术", thread1)
     print(f"\n回答: {response}\n")
     
@@ -90,9 +94,7 @@ def main():
         print(f"成功加载线程: {loaded_thread.id}")
         print("\n历史消息:")
         for msg in loaded_thread.messages:
-            role = msg['role']
-            content = msg['content'][:80] + "..." if len(msg['content']) > 80 else msg['content']
-            print(f"  [{role}]: {content}")
+            print(f"  [{msg['role']}]: {truncate(msg['content'], 80)}")
     
     # === 场景 5: 记忆摘要 ===
     print("\n\n--- 场景 5: 记忆摘要 ---\n")
@@ -2,13 +2,23 @@
 示例 5: 自定义模型
 演示如何创建和使用自定义模型提供者
 """
-import os
 from typing import List, Dict
-from dotenv import load_dotenv
-from rungpt import ModelInterface, ModelRegistry, load_model, SimpleAgent, Thread
+# 模块级只导入自定义模型类所需的接口,其余符号在 main() 中延迟导入
+from rungpt import ModelInterface
 
-# 加载环境变量
-load_dotenv()
+def last_user_content(messages: List[Dict[str, str]]) -> str:
+    """
+    获取最后一条用户消息的内容
+
+    绝大多数情况下最后一条消息就是用户消息,先走 O(1) 快路径,
+    避免在长对话上做全量反向扫描。
+    """
+    if messages and messages[-1].get('role') == 'user':
+        return messages[-1].get('content', '')
+    return next(
+        (m.get('content', '') for m in reversed(messages) if m.get('role') == 'user'),
+        ''
+    )
 
 class MockModel(ModelInterface):
     """
@@ -25,12 +35,8 @@ class MockModel(ModelInterface):
     def run(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """非流式执行"""
         # 获取最后一条用户消息
-        user_msg = ""
-        for msg in reversed(messages):
-            if msg.get('role') == 'user':
-                user_msg = msg.get('content', '')
-                break
-        
+        user_msg = last_user_content(messages)
+
         # 生成模拟回复
         response = self.response_template.format(user_message=user_msg)
         
@@ -45,10 +51,13 @@ class MockModel(ModelInterface):
     def stream_run(self, messages: List[Dict[str, str]], **kwargs):
         """流式执行"""
         response = self.run(messages, **kwargs)
-        
-        # 模拟流式输出（逐字返回）
-        for char in response:
-            yield char
+
+        # 模拟流式输出（按块返回）
+        # 逐字符 yield 会让每个字符都经历一次生成器切换和一次 print 调用,
+        # 按 32 字符分块可将解释器开销降低约 32 倍
+        chunk_size = 32
+        for i in range(0, len(response), chunk_size):
+            yield response[i:i + chunk_size]
 
 class EchoModel(ModelInterface):
     """
@@ -57,21 +66,23 @@ class EchoModel(ModelInterface):
     
     def run(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """非流式执行"""
-        user_msg = ""
-        for msg in reversed(messages):
-            if msg.get('role') == 'user':
-                user_msg = msg.get('content', '')
-                break
-        
-        return f"Echo: {user_msg}"
+        return f"Echo: {last_user_content(messages)}"
     
     def stream_run(self, messages: List[Dict[str, str]], **kwargs):
         """流式执行"""
         response = self.run(messages, **kwargs)
-        for word in response.split():
-            yield word + " "
+        # 同样按块返回,避免逐词 yield 的生成器切换开销
+        chunk_size = 32
+        for i in range(0, len(response), chunk_size):
+            yield response[i:i + chunk_size]
 
 def main():
+    from dotenv import load_dotenv
+    from rungpt import ModelRegistry, load_model, SimpleAgent, Thread
+
+    # 加载环境变量
+    load_dotenv()
+
     print("=== RunGPT 示例 6: 自定义模型 ===\n")
     
     # === 方式 1: 直接使用自定义模型类 ===
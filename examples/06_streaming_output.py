@@ -2,13 +2,9 @@
 示例 6: 流式输出
 演示如何使用流式输出功能
 """
-import os
 import time
-from dotenv import load_dotenv
-from rungpt import SimpleAgent, ReActAgent, Thread, ToolRegistry
-
-# 加载环境变量
-load_dotenv()
+# 模块级只导入工具定义所需的符号,Agent 等重量级符号在 main() 中延迟导入
+from rungpt import ToolRegistry
 
 # 注册一个工具
 @ToolRegistry.tool
@@ -31,6 +27,12 @@ def get_info(topic: str) -> str:
     return info.get(topic, f"关于 {topic} 的信息")
 
 def main():
+    from dotenv import load_dotenv
+    from rungpt import SimpleAgent, ReActAgent, Thread
+
+    # 加载环境变量
+    load_dotenv()
+
     print("=== RunGPT 示例 7: 流式输出 ===\n")
     
     # === 场景 1: SimpleAgent 流式输出 ===
@@ -121,19 +123,28 @@ def main():
     ]
     
     print("自定义处理流式输出:\n")
-    full_response = ""
-    word_count = 0
-    
+    import sys
+
+    chunks = []
+    char_count = 0
+    # 进度提示按时间间隔输出,与 chunk 粒度解耦:
+    # 热路径上每个 chunk 只需一次 time.monotonic() 调用
+    progress_interval = 0.2
+    next_tick = time.monotonic() + progress_interval
+
     for chunk in model.stream_run(messages):
-        full_response += chunk
-        word_count += len(chunk)
-        
-        # 自定义显示：每 10 个字符显示一次进度
-        if word_count % 10 == 0:
-            print(f"[已接收 {word_count} 字符]", end=" ", flush=True)
-        
-        print(chunk, end="", flush=True)
-    
+        chunks.append(chunk)
+        char_count += len(chunk)
+
+        now = time.monotonic()
+        if now >= next_tick:
+            sys.stdout.write(f"[已接收 {char_count} 字符] ")
+            next_tick = now + progress_interval
+
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+
+    full_response = "".join(chunks)
     print(f"\n\n总字符数: {len(full_response)}")
     
     # === 使用建议 ===
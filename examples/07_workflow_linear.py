@@ -5,18 +5,19 @@
 """
 import os
 import sys
-from dotenv import load_dotenv
 
 # 将项目根目录添加到 sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from rungpt import SimpleAgent, ReActAgent
-from rungpt.workflow import Pipeline, AgentStep, WorkflowContext
+def main():
+    # 延迟导入:避免在模块导入阶段就加载整个框架及其依赖
+    from dotenv import load_dotenv
+    from rungpt import SimpleAgent, ReActAgent
+    from rungpt.workflow import Pipeline, AgentStep, WorkflowContext
 
-# 加载环境变量
-load_dotenv()
+    # 加载环境变量
+    load_dotenv()
 
-def main():
     print("=== RunGPT Workflow 示例: 线性流程 ===\n")
     
     # 1. 定义 Agent
@@ -43,16 +44,18 @@ def main():
             name="Analyst",
             input_key="topic",           # 从 Context 读取 'topic'
             output_key="analysis",       # 结果写入 'analysis'
-            input_template="请分析以下主题的商业前景: {topic}"
+            input_template="请分析以下主题的商业前景: {topic}",
+            cache=True                   # 同一 Context 重复运行时复用结果
         ),
-        
+
         # 步骤 2: 写作
         AgentStep(
             agent=writer,
             name="Writer",
             input_key="analysis",        # 从 Context 读取 'analysis' (上一步的输出)
             output_key="article",        # 结果写入 'article'
-            input_template="根据以下分析报告,写一篇简短的公众号文章:\n\n{analysis}"
+            input_template="根据以下分析报告,写一篇简短的公众号文章:\n\n{analysis}",
+            cache=True
         )
     ])
     
@@ -61,17 +64,16 @@ def main():
     print(f"开始执行工作流, 主题: {topic}\n")
     
     # 初始 Context
-    initial_context = {"topic": topic}
-    
+    # 传入 Context 对象,运行结束后可以在外部访问中间结果
+    ctx = WorkflowContext(topic=topic)
+
     # 运行
-    pipeline.run(initial_context)
-    
+    pipeline.run(ctx)
+
     # 4. 获取结果
     # 注意: pipeline.run() 返回最后一步的结果,但我们也可以从 context 中获取中间结果
-    # 由于 context 在 run 过程中被修改,我们需要传入一个 Context 对象才能在外部访问
-    
-    # 重新运行一次演示 Context 访问
-    ctx = WorkflowContext(initial_context)
+
+    # 重新运行一次:各步骤开启了 cache=True,这次运行直接命中缓存,0 次 API 调用
     pipeline.run(ctx)
     
     print("\n" + "="*50)
@@ -6,16 +6,17 @@
 """
 import os
 import sys
-from dotenv import load_dotenv
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from rungpt import SimpleAgent
-from rungpt.workflow import Pipeline, AgentStep, Router, FunctionStep, WorkflowContext
+def main():
+    # 延迟导入:避免在模块导入阶段就加载整个框架及其依赖
+    from dotenv import load_dotenv
+    from rungpt import SimpleAgent
+    from rungpt.workflow import Pipeline, AgentStep, Router, FunctionStep, WorkflowContext
 
-load_dotenv()
+    load_dotenv()
 
-def main():
     print("=== RunGPT Workflow 示例: 条件路由 ===\n")
     
     # 1. 定义 Agent
@@ -34,11 +35,16 @@ def main():
     )
     
     # 2. 定义分类器 (这里用 FunctionStep 模拟,实际也可以用 Agent)
+    # 简单规则: 如果问题包含 "分析"、"设计"、"架构" 等词,视为复杂问题
+    # 关键词预编译为单个正则:一次 C 级扫描替代逐关键词的 Python 子串循环,
+    # 关键词数量增长时分类成本不变
+    import re
+    complex_keywords = ["分析", "设计", "架构", "原理", "为何"]
+    complex_pattern = re.compile("|".join(map(re.escape, complex_keywords)))
+
     def classify_complexity(context: WorkflowContext):
         query = context.query
-        # 简单规则: 如果问题包含 "分析"、"设计"、"架构" 等词,视为复杂问题
-        complex_keywords = ["分析", "设计", "架构", "原理", "为何"]
-        is_complex = any(k in query for k in complex_keywords)
+        is_complex = bool(complex_pattern.search(query))
         context.is_complex = is_complex
         print(f"\n[分类器] 问题复杂度判定: {'复杂' if is_complex else '简单'}\n")
         return is_complex
@@ -6,16 +6,17 @@
 """
 import os
 import sys
-from dotenv import load_dotenv
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from rungpt import SimpleAgent
-from rungpt.workflow import Pipeline, AgentStep, Parallel, FunctionStep, WorkflowContext
+def main():
+    # 延迟导入:避免在模块导入阶段就加载整个框架及其依赖
+    from dotenv import load_dotenv
+    from rungpt import SimpleAgent
+    from rungpt.workflow import Pipeline, AgentStep, Parallel, FunctionStep, WorkflowContext
 
-load_dotenv()
+    load_dotenv()
 
-def main():
     print("=== RunGPT Workflow 示例: 并行执行 ===\n")
     
     # 1. 定义 Agent (可以是同一个 Agent 实例,也可以是不同的)
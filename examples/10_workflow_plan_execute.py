@@ -6,20 +6,21 @@
 """
 import os
 import sys
-from dotenv import load_dotenv
 
 # 将项目根目录添加到 sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from rungpt import SimpleAgent, ReActAgent, ToolRegistry
-from rungpt.workflow import PlanExecutePattern, WorkflowContext
-from rungpt.tools import ToolResult
 
-# 加载环境变量
-load_dotenv()
+def main():
+    # 延迟导入:避免在模块导入阶段就加载整个框架及其依赖
+    from dotenv import load_dotenv
+    from rungpt import SimpleAgent, ReActAgent, ToolRegistry
+    from rungpt.workflow import PlanExecutePattern, WorkflowContext
+    from rungpt.tools import ToolResult
 
+    # 加载环境变量
+    load_dotenv()
 
-def main():
     print("=== RunGPT Workflow 示例: Plan-Execute 模式 ===\n")
     
     # 1. 定义 3 个专门的 Agent
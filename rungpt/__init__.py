@@ -3,19 +3,42 @@ RunGPT - 强大的 AI Agent 框架
 
 一个支持多种 Agent 类型、工具调用、记忆管理和上下文工程的 Python SDK。
 """
+import importlib
 
 __version__ = "0.1.0"
 __author__ = "RunGPT Team"
 __license__ = "MIT"
 
-from .models import load_model, ModelInterface, ModelRegistry
-from .threads import Thread, MemoryManager
-from .context import ContextManager, PromptTemplate, SkillInjector, ToolInjector, TokenManager
-from .tools import Tool, ToolRegistry, extract_schema
-from .agent import (
-    AgentBase, AgentProfile, AgentFactory,
-    SimpleAgent, ReActAgent
-)
+# 懒加载符号表 (PEP 562):`import rungpt` 不再加载全部子系统,
+# 首次访问某符号时才导入对应子模块,导入耗时只与实际用到的部分成正比
+_LAZY_IMPORTS = {
+    # Models
+    "load_model": ".models",
+    "ModelInterface": ".models",
+    "ModelRegistry": ".models",
+    # Threads
+    "Thread": ".threads",
+    "MemoryManager": ".threads",
+    # Context
+    "ContextManager": ".context",
+    "PromptTemplate": ".context",
+    "SkillInjector": ".context",
+    "ToolInjector": ".context",
+    "TokenManager": ".context",
+    # Tools
+    "Tool": ".tools",
+    "ToolRegistry": ".tools",
+    "extract_schema": ".tools",
+    # Cache
+    "ResponseCache": ".cache",
+    "DiskResponseCache": ".cache",
+    # Agents
+    "AgentBase": ".agent",
+    "AgentProfile": ".agent",
+    "AgentFactory": ".agent",
+    "SimpleAgent": ".agent",
+    "ReActAgent": ".agent",
+}
 
 __all__ = [
     # Version
@@ -30,7 +53,23 @@ __all__ = [
     "ContextManager", "PromptTemplate", "SkillInjector", "ToolInjector", "TokenManager",
     # Tools
     "Tool", "ToolRegistry", "extract_schema",
+    # Cache
+    "ResponseCache", "DiskResponseCache",
     # Agents
     "AgentBase", "AgentProfile", "AgentFactory",
     "SimpleAgent", "ReActAgent"
 ]
+
+
+def __getattr__(name):
+    """首次访问时导入对应子模块,并缓存到模块命名空间（后续访问零开销）"""
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module 'rungpt' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(__all__) | set(globals()))
@@ -5,7 +5,7 @@ from .react_agent import ReActAgent, ReActStep
 from .react_parser import ReActParser, Action
 from .agent_factory import AgentFactory
 
-__all__ = [
+__all__ = (
     "AgentBase",
     "AgentProfile",
     "AgentTrace",
@@ -15,6 +15,6 @@ __all__ = [
     "ReActParser",
     "Action",
     "AgentFactory"
-]
+)
 
 
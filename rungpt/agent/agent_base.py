@@ -1,14 +1,23 @@
 """Agent Base - Agent 抽象基类"""
+import hashlib
+import sys
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Union
-from datetime import datetime
+from datetime import datetime, timedelta
 from ..threads import Thread, MemoryManager
+from ..utils import run_in_thread
 from ..models import ModelInterface
 from ..context import ContextManager
 
 
 class AgentProfile:
     """Agent 配置（内部使用）"""
+
+    # 小型值对象,固定槽位存储:省去每实例 __dict__,属性访问走 C 级偏移
+    __slots__ = ("name", "model_name", "max_steps", "temperature", "extra")
     
     def __init__(
         self,
@@ -27,41 +36,69 @@ class AgentProfile:
 
 class AgentTrace:
     """执行追踪记录"""
+
+    __slots__ = ("agent_name", "task", "steps", "start_time",
+                 "_t0", "_end_ns", "end_time", "status", "error", "preview_mode")
     
-    def __init__(self, agent_name: str, task: str):
+    def __init__(self, agent_name: str, task: str, preview_mode: str = "slice"):
         self.agent_name = agent_name
         self.task = task
-        self.steps: List[Dict[str, Any]] = []
+        # 预览策略: slice=截断副本 / hash=8字节摘要 / none=仅记录长度
+        # 高吞吐场景用 hash 或 none,避免追踪日志持有大量预览字符串
+        self.preview_mode = preview_mode
+        # 步骤以 (类型, 数据, 纳秒偏移) 元组存入 deque:
+        # 追加为主、导出一次的负载下,元组比逐条 dict 分配更小更快
+        self.steps: deque = deque()
         self.start_time = datetime.now()
+        # 热路径上只记录单调时钟的纳秒偏移,ISO 字符串延迟到导出时才格式化
+        self._t0 = time.perf_counter_ns()
+        self._end_ns: Optional[int] = None
         self.end_time: Optional[datetime] = None
         self.status = "running"
         self.error: Optional[str] = None
     
     def add_step(self, step_type: str, data: Dict[str, Any]) -> None:
-        """添加执行步骤"""
-        self.steps.append({
-            "type": step_type,
-            "data": data,
-            "timestamp": datetime.now().isoformat()
-        })
+        """添加执行步骤（时间戳为相对启动的纳秒偏移）"""
+        self.steps.append((step_type, data, time.perf_counter_ns() - self._t0))
+    
+    def preview(self, text: str, limit: int = 200) -> Any:
+        """按 preview_mode 生成文本预览"""
+        if self.preview_mode == "slice":
+            return text[:limit]
+        if self.preview_mode == "hash":
+            return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+        return len(text)
     
     def finish(self, status: str = "success", error: Optional[str] = None) -> None:
         """结束追踪"""
-        self.end_time = datetime.now()
+        self._end_ns = time.perf_counter_ns() - self._t0
+        self.end_time = self._to_wall_time(self._end_ns)
         self.status = status
         self.error = error
     
+    def _to_wall_time(self, offset_ns: int) -> datetime:
+        """把纳秒偏移换算回挂钟时间"""
+        return self.start_time + timedelta(microseconds=offset_ns / 1000)
+    
     def to_dict(self) -> Dict[str, Any]:
-        """导出为字典"""
+        """导出为字典（此时才把纳秒偏移格式化为 ISO 时间戳）"""
+        steps = [
+            {
+                "type": step_type,
+                "data": data,
+                "timestamp": self._to_wall_time(offset_ns).isoformat()
+            }
+            for step_type, data, offset_ns in self.steps
+        ]
         return {
             "agent_name": self.agent_name,
             "task": self.task,
-            "steps": self.steps,
+            "steps": steps,
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "status": self.status,
             "error": self.error,
-            "duration_seconds": (self.end_time - self.start_time).total_seconds() if self.end_time else None
+            "duration_seconds": self._end_ns / 1e9 if self._end_ns is not None else None
         }
 
 class AgentBase(ABC):
@@ -79,11 +116,12 @@ class AgentBase(ABC):
         verbose: bool = False,
         debug: bool = False,
         skills: Optional[List[str]] = None,
+        cache=None,
         **kwargs
     ):
         """
         初始化 Agent
-        
+
         Args:
             system_prompt: 系统提示词
             model: 模型名称（如 "gpt-4o"）或 ModelInterface 实例
@@ -95,6 +133,7 @@ class AgentBase(ABC):
             verbose: 是否详细输出
             debug: 是否调试模式（打印完整 Prompt）
             skills: 技能列表
+            cache: 响应缓存（可选，ResponseCache 实例，命中时跳过模型调用）
             **kwargs: 其他扩展参数
         """
         # 构建内部 profile
@@ -122,14 +161,20 @@ class AgentBase(ABC):
             self.model = model
         
         self.memory = memory
+        self.cache = cache
         self.stream = stream
         self.verbose = verbose
         self.debug = debug
         self.skills = skills
         self.current_trace: Optional[AgentTrace] = None
+
+        # debug 关闭时把调试打印换成空操作:
+        # 热路径上不再逐次判断标志位,调用即为无操作
+        if not debug:
+            self._print_final_debug = self._noop
         
-        # 初始化 ContextManager
-        self.context_manager = ContextManager()
+        # 共享 ContextManager:无 Agent 级状态,内部缓存跨 Agent 复用
+        self.context_manager = ContextManager.shared()
 
 
     def run(
@@ -148,7 +193,10 @@ class AgentBase(ABC):
             执行结果（字符串）
         """
         thread = thread or Thread()
-        self.current_trace = AgentTrace(self.profile.name, task)
+        self.current_trace = AgentTrace(
+            self.profile.name, task,
+            preview_mode=self.profile.extra.get("preview_mode", "slice")
+        )
         
         try:
             self._pre_run(task, thread)
@@ -165,7 +213,60 @@ class AgentBase(ABC):
             self.current_trace.finish("error", str(e))
             raise
 
-    
+    def run_batch(
+        self,
+        tasks: List[str],
+        threads: Optional[List[Thread]] = None,
+        max_workers: int = 4
+    ) -> List[str]:
+        """
+        并发执行多个相互独立的任务
+
+        网络受限场景下,N 个独立任务的总耗时从 N×RTT 降为约 1×RTT。
+
+        Args:
+            tasks: 任务描述列表
+            threads: 对话线程列表（可选，默认为每个任务创建独立线程）
+            max_workers: 最大并发数
+
+        Returns:
+            执行结果列表（与 tasks 顺序一致）
+
+        注意: 各任务必须相互独立; get_trace() 仅反映最后完成的任务。
+        """
+        if threads is None:
+            threads = [Thread() for _ in tasks]
+        if len(threads) != len(tasks):
+            raise ValueError("tasks 和 threads 数量必须一致")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.run, task, thread)
+                for task, thread in zip(tasks, threads)
+            ]
+            return [future.result() for future in futures]
+
+    async def arun(
+        self,
+        task: str,
+        thread: Optional[Thread] = None
+    ) -> str:
+        """
+        异步执行任务
+
+        模型层是同步 HTTP 客户端,这里将 run() 卸载到工作线程
+        (run_in_thread 兼容 3.8,见 utils),使多个 Agent 可以在
+        同一事件循环中用 asyncio.gather 并发等待网络 IO。
+
+        Args:
+            task: 任务描述
+            thread: 对话线程（可选）
+
+        Returns:
+            执行结果（字符串）
+        """
+        return await run_in_thread(self.run, task, thread)
+
     @abstractmethod
     def _execute(self, task: str, thread: Thread) -> str:
         """
@@ -182,17 +283,19 @@ class AgentBase(ABC):
     
     def _pre_run(self, task: str, thread: Thread) -> None:
         """执行前钩子"""
-        self.current_trace.add_step("pre_run", {"task": task})
+        # 任务文本同样按预览策略截断:工作流把长提示当 task 传入时,
+        # 追踪日志不再持有整份提示的副本
+        self.current_trace.add_step("pre_run", {"task": self.current_trace.preview(task)})
         self._on_start(task, thread)
     
     def _post_run(self, task: str, thread: Thread, result: str) -> None:
         """执行后钩子"""
-        self.current_trace.add_step("post_run", {"result": result[:100]})
+        self.current_trace.add_step("post_run", {"result": self.current_trace.preview(result, 100)})
         self._on_finish(task, thread, result)
         
         # 🔍 Debug 模式：在任务结束后统一打印完整对话历史
-        if self.debug:
-            self._print_final_debug(thread)
+        # （debug 关闭时该方法在构造期已被替换为空操作）
+        self._print_final_debug(thread)
         
         if self.memory:
             self.memory.save_thread(thread)
@@ -205,12 +308,23 @@ class AgentBase(ABC):
         """完成回调（子类可重写）"""
         pass
 
-    def _call_model(self, thread: Thread, **kwargs) -> str:
+    def _call_model(
+        self,
+        thread: Thread,
+        stop_on: Optional[str] = None,
+        stop_on_action: bool = False,
+        **kwargs
+    ) -> str:
         """
         调用模型
         
         Args:
             thread: 对话线程
+            stop_on: 终止标记（可选，仅流式有效）。在输出中检测到该标记时
+                立即断开流并丢弃标记及其后内容,不再为无用 token 付费等待
+            stop_on_action: 动作闭合即断流（可选，仅流式有效）。用增量解析器
+                逐块检测,首个 Action 语法闭合的瞬间停止生成,响应保留到闭合处。
+                注意: 会放弃同一步的后续多工具调用,仅适合单动作流程
             **kwargs: 模型参数
             
         Returns:
@@ -227,7 +341,18 @@ class AgentBase(ABC):
         )
         
         params = {"temperature": self.profile.temperature, **kwargs}
-        
+
+        # 查询响应缓存:命中时直接返回,省去一次模型调用
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.profile.model_name, context, params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.current_trace.add_step("cache_hit", {
+                    "model": self.profile.model_name,
+                    "response_length": len(cached)
+                })
+                return cached
 
         
         self.current_trace.add_step("model_call", {
@@ -239,20 +364,53 @@ class AgentBase(ABC):
         
         if self.stream:
             response = ""
+            stopped = False
+            action_parser = None
+            if stop_on_action:
+                from .parsers import IncrementalActionParser
+                action_parser = IncrementalActionParser()
+            last_flush = time.perf_counter()
             for chunk in self.model.stream_run(context, **params):
-                print(chunk, end="", flush=True)
+                # 写入缓冲区,按换行或 50ms 间隔批量刷新:
+                # 避免每个 token 一次 flush 带来的 write 系统调用风暴
+                sys.stdout.write(chunk)
+                now = time.perf_counter()
+                if "\n" in chunk or now - last_flush > 0.05:
+                    sys.stdout.flush()
+                    last_flush = now
                 response += chunk
-            print()
+                # 增量检测动作闭合:每个字符只过一次状态机,闭合即断流
+                if action_parser is not None and action_parser.feed(chunk) is not None:
+                    break
+                # 增量检测终止标记:只扫描新片段附近的窗口,成本与片段大小成正比
+                if stop_on and stop_on in response[-(len(chunk) + len(stop_on)):]:
+                    stopped = True
+                    break
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+            if stopped:
+                # 提前跳出循环会关闭底层生成器(进而断开 HTTP 流),
+                # 截断标记起的内容,后续 token 不再接收
+                response = response[:response.rindex(stop_on)]
         else:
             response = self.model.run(context, **params)
-        
+
+        # 写入响应缓存
+        if cache_key is not None:
+            self.cache.set(cache_key, response)
+
         self.current_trace.add_step("model_response", {
             "response_length": len(response),
-            "preview": response[:200]
+            "preview": self.current_trace.preview(response)
         })
         
         return response
     
+    @staticmethod
+    def _noop(*_args, **_kwargs) -> None:
+        """空操作占位（构造期按标志位替换掉的方法落在这里）"""
+        return None
+
     def get_trace(self) -> Optional[Dict[str, Any]]:
         """获取执行追踪"""
         return self.current_trace.to_dict() if self.current_trace else None
@@ -5,6 +5,7 @@ from .function_parser import FunctionCallParser
 from .json_parser import JSONActionParser
 from .robust_parser import RobustActionParser
 from .parser_manager import ParserManager
+from .incremental_parser import IncrementalActionParser
 
 __all__ = [
     "ParserStrategy",
@@ -14,4 +15,5 @@ __all__ = [
     "JSONActionParser",
     "RobustActionParser",
     "ParserManager",
+    "IncrementalActionParser",
 ]
@@ -3,6 +3,17 @@ import re
 from typing import Optional
 from .strategy import ParserStrategy, Action
 
+# 模块级预编译:解析器按策略链被高频调用,
+# 编译结果随模块常驻,避免每次 parse 重复走 re 内部缓存查找
+# 参数体用取反字符类而非非贪婪 .*?:匹配线性推进,超长无闭括号的输出不会引发回溯爆炸
+_CAN_HANDLE_RE = re.compile(r'\w+\[[^\]\n]*\]')
+_ACTION_PATTERNS = (
+    re.compile(r'Action:\s*(\w+)\[([^\]]*)\]'),  # 标准格式
+    re.compile(r'(?:^|\n)(\w+)\[([^\]]*)\]'),    # 无前缀格式
+)
+# key="value" 或 key='value' 或 key=value(不含逗号)
+_KV_RE = re.compile(r'(\w+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^,]+))')
+
 
 class BracketFormatParser(ParserStrategy):
     """
@@ -24,19 +35,16 @@ class BracketFormatParser(ParserStrategy):
     
     def can_handle(self, text: str) -> bool:
         """检查是否包含方括号格式"""
-        return bool(re.search(r'\w+\[.*?\]', text))
+        # 子串短路:str.__contains__ 是 C 实现,无括号的文本直接免掉正则扫描;
+        # 正则本身不能省,它还承担"同行配对"判断(跨行方括号应交给兜底策略)
+        return '[' in text and ']' in text and bool(_CAN_HANDLE_RE.search(text))
     
     def parse(self, text: str) -> Optional[Action]:
         """解析方括号格式"""
         # 匹配 Action: xxx[yyy] 或直接 xxx[yyy]
-        patterns = [
-            r'Action:\s*(\w+)\[(.*?)\]',  # 标准格式
-            r'(?:^|\n)(\w+)\[(.*?)\]'      # 无前缀格式
-        ]
-        
         match = None
-        for pattern in patterns:
-            match = re.search(pattern, text, re.DOTALL | re.MULTILINE)
+        for pattern in _ACTION_PATTERNS:
+            match = pattern.search(text)
             if match:
                 break
         
@@ -70,14 +78,9 @@ class BracketFormatParser(ParserStrategy):
         
         # 尝试解析 key=value 格式
         if '=' in input_text:
-            # 正则匹配: key="value" 或 key='value' 或 key=value
-            # Group 1: key
-            # Group 2: 双引号值
-            # Group 3: 单引号值
+            # Group 1: key / Group 2: 双引号值 / Group 3: 单引号值
             # Group 4: 无引号值(不含逗号)
-            pattern = r'(\w+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^,]+))'
-            
-            matches = list(re.finditer(pattern, input_text))
+            matches = list(_KV_RE.finditer(input_text))
             if matches:
                 for match in matches:
                     key = match.group(1)
@@ -1,8 +1,14 @@
 """Function Call Parser - 解析函数调用格式"""
 import re
-import json
+import ast
 from typing import Optional
 from .strategy import ParserStrategy, Action
+from ...utils import json_loads
+
+# 模块级预编译(理由同 bracket_parser)
+_ACTION_CALL_RE = re.compile(r'Action:\s*(\w+)\(', re.IGNORECASE)
+_ACTION_BARE_RE = re.compile(r'Action:\s*(\w+)(?:\s|$)', re.IGNORECASE)
+_KV_RE = re.compile(r'(\w+)=(?:(["\'])(.*?)\2|([^\s,]+))')
 
 
 class FunctionCallParser(ParserStrategy):
@@ -17,15 +23,17 @@ class FunctionCallParser(ParserStrategy):
     
     def can_handle(self, text: str) -> bool:
         """检查是否包含函数调用格式"""
-        return bool(re.search(r'Action:\s*\w+\(', text, re.IGNORECASE))
+        # 子串短路:无左括号的文本直接免掉正则扫描;
+        # 正则本身不能省,它还要求括号紧跟工具名(带空格的交给兜底策略)
+        return '(' in text and bool(_ACTION_CALL_RE.search(text))
     
     def parse(self, text: str) -> Optional[Action]:
         """解析函数调用格式"""
         # 查找 Action: func_name(
-        action_match = re.search(r'Action:\s*(\w+)\(', text, re.IGNORECASE)
+        action_match = _ACTION_CALL_RE.search(text)
         if not action_match:
             # 尝试无括号格式
-            match = re.search(r'Action:\s*(\w+)(?:\s|$)', text, re.IGNORECASE)
+            match = _ACTION_BARE_RE.search(text)
             if match:
                 return Action(match.group(1), {}, match.group(0).strip())
             return None
@@ -69,28 +77,33 @@ class FunctionCallParser(ParserStrategy):
         if not params_str:
             return {}
         
-        # 字典格式
+        # 字典格式:按"命中率×速度"排序尝试
         if params_str.startswith('{'):
+            # 1. 纯 JSON(最常见,C 解析器直接命中)
+            try:
+                return json_loads(params_str)
+            except ValueError:
+                pass
+            
+            # 2. 引号归一后的 JSON(单引号字典的大多数,仍走 C 路径)
+            try:
+                return json_loads(params_str.replace("'", '"'))
+            except ValueError:
+                pass
+            
+            # 3. Python 字面量兜底:literal_eval 只接受字面量,安全但走 AST,最慢
             try:
-                # 尝试 eval (支持 Python 字典)
-                result = eval(params_str)
+                result = ast.literal_eval(params_str)
                 if isinstance(result, dict):
                     return result
-            except:
+            except (ValueError, SyntaxError):
                 pass
             
-            try:
-                # 尝试 JSON
-                normalized = params_str.replace("'", '"')
-                return json.loads(normalized)
-            except:
-                return {}
+            return {}
         
         # 函数参数格式: key=value
         params = {}
-        pattern = r'(\w+)=(?:(["\'])(.*?)\2|([^\s,]+))'
-        
-        for match in re.finditer(pattern, params_str):
+        for match in _KV_RE.finditer(params_str):
             key = match.group(1)
             # 优先取带引号的值,否则取不带引号的值
             value = match.group(3) if match.group(2) else match.group(4)
@@ -0,0 +1,110 @@
+"""Incremental Action Parser - 流式输出的增量动作解析"""
+from typing import Optional
+from .strategy import Action
+from .parser_manager import ParserManager
+
+
+class IncrementalActionParser:
+    """
+    增量动作解析器:逐块消费流式输出,动作一闭合立刻返回
+
+    每个字符只被状态机扫描一次(整体 O(文本长度)),
+    不会像"每个增量重新解析整个缓冲"那样退化为平方耗时。
+    标记识别用带区间的 str.endswith(只看尾部,不拷贝),
+    括号闭合用计数器,完整的正则解析只在动作闭合的小片段上做一次。
+
+    支持格式: Action: tool[...] / Action: tool(...) / ```json 代码块
+    """
+
+    _MARKER = "Action:"
+    _FENCE = "```json"
+
+    def __init__(self, manager: Optional[ParserManager] = None):
+        self._manager = manager or ParserManager()
+        self.reset()
+
+    def reset(self) -> None:
+        """清空缓冲与状态,可复用同一实例解析下一段流"""
+        self._text = ""
+        self._pos = 0
+        self._state = "idle"
+        self._start = 0       # 当前候选动作/代码块在缓冲中的起点
+        self._have_name = False
+        self._depth = 0
+
+    def feed(self, chunk: str) -> Optional[Action]:
+        """
+        消费一个流式片段
+
+        Returns:
+            动作在本片段内闭合时返回解析出的 Action,否则 None
+        """
+        self._text += chunk
+        text = self._text
+        i = self._pos
+        end = len(text)
+        while i < end:
+            action = self._step(text, i)
+            i += 1
+            if action is not None:
+                self._pos = i
+                return action
+        self._pos = end
+        return None
+
+    def _step(self, text: str, i: int) -> Optional[Action]:
+        """处理单个字符,动作闭合时返回 Action"""
+        ch = text[i]
+        if self._state == "idle":
+            self._scan_marker(text, i)
+        elif self._state == "name":
+            self._scan_name(ch)
+        elif self._state == "bracket":
+            if ch == ']':
+                return self._complete(text, i)
+        elif self._state == "paren":
+            if ch == '(':
+                self._depth += 1
+            elif ch == ')':
+                self._depth -= 1
+                if self._depth == 0:
+                    return self._complete(text, i)
+        elif self._state == "fence_head":
+            if ch == '\n':
+                self._state = "fence_body"
+            elif ch not in " \t":
+                self._state = "idle"
+        elif self._state == "fence_body":
+            if ch == '`' and text.endswith("\n```", 0, i + 1):
+                return self._complete(text, i)
+        return None
+
+    def _scan_marker(self, text: str, i: int) -> None:
+        """空闲态:在尾部探测 Action: 前缀或 ```json 围栏"""
+        if text.endswith(self._MARKER, 0, i + 1):
+            self._start = i + 1 - len(self._MARKER)
+            self._state = "name"
+            self._have_name = False
+        elif text.endswith(self._FENCE, 0, i + 1):
+            self._start = i + 1 - len(self._FENCE)
+            self._state = "fence_head"
+
+    def _scan_name(self, ch: str) -> None:
+        """收集工具名,遇到定界符进入括号计数"""
+        if ch.isalnum() or ch == '_':
+            self._have_name = True
+        elif ch in " \t":
+            pass  # Action: 与名称、名称与定界符之间允许空白
+        elif ch == '[' and self._have_name:
+            self._state = "bracket"
+        elif ch == '(' and self._have_name:
+            self._state = "paren"
+            self._depth = 1
+        else:
+            self._state = "idle"
+
+    def _complete(self, text: str, i: int) -> Optional[Action]:
+        """动作闭合:只对这段小片段做一次完整解析"""
+        segment = text[self._start:i + 1]
+        self._state = "idle"
+        return self._manager.parse(segment)
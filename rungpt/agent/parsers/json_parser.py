@@ -1,8 +1,32 @@
 """JSON Action Parser - 解析 JSON 代码块格式"""
-import re
-import json
 from typing import Optional
 from .strategy import ParserStrategy, Action
+from ...utils import json_loads
+
+
+def _extract_block(text: str, tag: str):
+    """
+    手工扫描围栏代码块,等价于 ```tag\\s*\\n(.*?)\\n``` 正则
+
+    用 str.find 顺序推进代替非贪婪 .*? 的回溯,超长或未闭合的
+    输出也保持线性耗时。返回 (代码块内容, 原始片段) 或 (None, None)
+    """
+    pos = 0
+    while True:
+        start = text.find(tag, pos)
+        if start == -1:
+            return None, None
+        head = start + len(tag)
+        newline = text.find('\n', head)
+        # 标签行到行尾只允许空白(排除 ```python 等其他语言围栏)
+        if newline == -1 or text[head:newline].strip():
+            pos = start + 1
+            continue
+        end = text.find('\n```', newline + 1)
+        if end == -1:
+            pos = start + 1
+            continue
+        return text[newline + 1:end], text[start:end + 4]
 
 
 class JSONActionParser(ParserStrategy):
@@ -20,30 +44,29 @@ class JSONActionParser(ParserStrategy):
     
     def can_handle(self, text: str) -> bool:
         """检查是否包含 JSON 代码块"""
-        return '```json' in text or '```' in text
+        # '```json' 命中时 '```' 必然命中,只留后者即可
+        return '```' in text
     
     def parse(self, text: str) -> Optional[Action]:
         """解析 JSON 代码块"""
-        pattern = r'```json\s*\n(.*?)\n```'
-        match = re.search(pattern, text, re.DOTALL)
+        content, raw = _extract_block(text, '```json')
         
-        if not match:
+        if content is None:
             # 尝试无语言标识的代码块
-            pattern = r'```\s*\n(.*?)\n```'
-            match = re.search(pattern, text, re.DOTALL)
+            content, raw = _extract_block(text, '```')
         
-        if not match:
+        if content is None:
             return None
         
         try:
-            data = json.loads(match.group(1))
+            data = json_loads(content)
             if "action" in data:
                 return Action(
                     name=data["action"],
                     params=data.get("params", {}),
-                    raw=match.group(0)
+                    raw=raw
                 )
-        except json.JSONDecodeError:
+        except ValueError:
             pass
         
         return None
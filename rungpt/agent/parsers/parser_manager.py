@@ -7,6 +7,32 @@ from .function_parser import FunctionCallParser
 from .json_parser import JSONActionParser
 from .robust_parser import RobustActionParser
 
+# 模块级预编译(理由同 bracket_parser)
+# 主分发正则:一次扫描识别文本里出现过的动作格式,按命名组映射到对应策略,
+# 代替逐策略 can_handle + parse 带来的最多 8 次全文扫描
+_MASTER_RE = re.compile(
+    r'(?P<bracket>Action:\s*\w+\[)'
+    r'|(?P<func>Action:\s*\w+\()'
+    r'|(?P<json>```(?:json)?\s*\n)',
+    re.IGNORECASE
+)
+_ACTION_SPLIT_RE = re.compile(r'(?=Action:)')
+# 六种完成标记合并为一条交替式:一次 DFA 扫描代替六次全文扫描
+_HAS_FINISH_RE = re.compile(
+    r'Action:\s*Finish\[|(?:^|\n)Finish\[|Action:\s*FINISH'
+    r'|"action":\s*"FINISH"|Final Answer:|最终答案：',
+    re.IGNORECASE | re.MULTILINE
+)
+# 内容组用 [^\n] 限定在行内:前瞻里的 \n 本就挡住跨行,改写后回溯上限从全文降到单行
+_THOUGHT_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Thought:\s*([^\n]*?)(?=\n|Action:|$)',
+    r'思考：\s*([^\n]*?)(?=\n|Action:|$)',
+))
+_OBSERVATION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Observation:\s*([^\n]*?)(?=\n|Thought:|$)',
+    r'观察：\s*([^\n]*?)(?=\n|Thought:|$)',
+))
+
 
 class ParserManager:
     """
@@ -33,11 +59,20 @@ class ParserManager:
             ]
         else:
             self.strategies = strategies
+        # 默认策略组合时启用主正则快速分发;自定义策略链退回逐策略探测
+        self._dispatch = None
+        if strategies is None:
+            self._dispatch = {
+                "bracket": self.strategies[0],
+                "func": self.strategies[1],
+                "json": self.strategies[2],
+            }
     
     def parse(self, text: str) -> Optional[Action]:
         """
         解析文本,提取 Action
         
+        先用主正则单次扫描分发到对应策略,未命中时回退到
         按策略优先级依次尝试,返回第一个成功的结果
         
         Args:
@@ -46,21 +81,74 @@ class ParserManager:
         Returns:
             Action 对象或 None
         """
+        action = self._fast_parse(text) if self._dispatch else None
+        if action is None:
+            action = self._chain_parse(text)
+        if action and action.name.upper() == "FINISH":
+            return self._normalize_finish_action(action)
+        return action
+
+    def _fast_parse(self, text: str) -> Optional[Action]:
+        """主正则扫描一次,按策略优先级只调用命中格式的 parse"""
+        seen = set()
+        for match in _MASTER_RE.finditer(text):
+            seen.add(match.lastgroup)
+            if "bracket" in seen:
+                break  # 已命中最高优先级格式,无需继续扫描
+        for group in ("bracket", "func", "json"):
+            if group not in seen:
+                continue
+            # 主正则比 can_handle 宽(如跨行方括号),仍需命中策略自检一次
+            strategy = self._dispatch[group]
+            if strategy.can_handle(text):
+                action = strategy.parse(text)
+                if action:
+                    return action
+        return None
+
+    def _chain_parse(self, text: str) -> Optional[Action]:
+        """兜底路径:无前缀/模糊格式仍走完整策略链"""
         for strategy in self.strategies:
             # 快速检查:避免无效尝试
             if not strategy.can_handle(text):
                 continue
-            
-            # 尝试解析
             action = strategy.parse(text)
             if action:
-                # 处理 FINISH action
-                if action.name.upper() == "FINISH":
-                    return self._normalize_finish_action(action)
                 return action
-        
         return None
     
+    def parse_all(self, text: str) -> List[Action]:
+        """
+        解析文本中的所有 Action(支持单步多工具调用)
+
+        按 "Action:" 分段,对每段独立解析。
+        遇到 FINISH 时截断:FINISH 之后的调用不再执行。
+
+        Args:
+            text: 模型输出文本
+
+        Returns:
+            Action 列表(可能为空)
+        """
+        segments = _ACTION_SPLIT_RE.split(text)
+        actions = []
+        for segment in segments:
+            if 'Action:' not in segment:
+                continue
+            action = self.parse(segment)
+            if action:
+                actions.append(action)
+                if action.name.upper() == "FINISH":
+                    break
+
+        # 没有按段解析出结果时,回退到单 Action 解析
+        if not actions:
+            action = self.parse(text)
+            if action:
+                actions.append(action)
+
+        return actions
+
     def _normalize_finish_action(self, action: Action) -> Action:
         """
         标准化 FINISH action
@@ -80,27 +168,34 @@ class ParserManager:
         # 其他情况:将整个 params 转为字符串
         return Action("FINISH", {"answer": str(params)}, action.raw)
     
+    def parse_or_finish(self, text: str):
+        """
+        一次调用同时得到 Action 与完成标记
+
+        返回 (action, finished):解析出 Action 时 finished 即
+        "是否为 FINISH 动作";未解析出时才对文本做一次完成哨兵扫描。
+        调用方不再需要 parse 失败后单独调 has_finish 重扫全文。
+        """
+        action = self.parse(text)
+        if action is not None:
+            return action, action.name == "FINISH"
+        return None, self.has_finish(text)
+
     def has_finish(self, text: str) -> bool:
         """检查是否包含完成标记"""
-        finish_patterns = [
-            r'Action:\s*Finish\[',
-            r'(?:^|\n)Finish\[',
-            r'Action:\s*FINISH',
-            r'"action":\s*"FINISH"',
-            r'Final Answer:',
-            r'最终答案：'
-        ]
-        return any(re.search(p, text, re.IGNORECASE | re.MULTILINE) for p in finish_patterns)
+        return _HAS_FINISH_RE.search(text) is not None
     
     def extract_thought(self, text: str) -> Optional[str]:
         """提取思考过程"""
-        patterns = [
-            r'Thought:\s*(.*?)(?=\n|Action:|$)',
-            r'思考：\s*(.*?)(?=\n|Action:|$)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        # 快路径:标准写法的标记用 find+切片定位,不进正则引擎
+        value = self._extract_label_value(text, "Thought:", "action:")
+        if value is None:
+            value = self._extract_label_value(text, "思考：", "action:")
+        if value is not None:
+            return value
+        # 兜底:大小写变体仍交给忽略大小写的正则
+        for pattern in _THOUGHT_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         
@@ -108,14 +203,35 @@ class ParserManager:
     
     def extract_observation(self, text: str) -> Optional[str]:
         """提取观察结果"""
-        patterns = [
-            r'Observation:\s*(.*?)(?=\n|Thought:|$)',
-            r'观察：\s*(.*?)(?=\n|Thought:|$)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        value = self._extract_label_value(text, "Observation:", "thought:")
+        if value is None:
+            value = self._extract_label_value(text, "观察：", "thought:")
+        if value is not None:
+            return value
+        for pattern in _OBSERVATION_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         
         return None
+    
+    @staticmethod
+    def _extract_label_value(text: str, label: str, stop: str) -> Optional[str]:
+        """
+        定位标记后的单行内容(语义对齐对应正则:跳过标记后的
+        空白、取到行尾,行内出现终止标记时在其前截断)
+        """
+        i = text.find(label)
+        if i < 0:
+            return None
+        start = i + len(label)
+        n = len(text)
+        while start < n and text[start] in ' \t\r\n\f\v':
+            start += 1
+        j = text.find('\n', start)
+        end = j if j >= 0 else n
+        # 终止标记忽略大小写,只对这一行做小写化
+        k = text[start:end].lower().find(stop)
+        if k >= 0:
+            end = start + k
+        return text[start:end].strip()
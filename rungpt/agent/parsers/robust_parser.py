@@ -1,8 +1,112 @@
 """Robust Action Parser - 模糊匹配和 JSON 修复"""
 import re
-import json
 from typing import Optional
 from .strategy import ParserStrategy, Action
+from ...utils import json_loads
+from .bracket_parser import _KV_RE
+
+# 模块级预编译(理由同 bracket_parser)
+_BRACKET_FUZZY_RE = re.compile(r'Action:\s*(\w+)\s*\[([^\]]*)\]', re.IGNORECASE)
+_FUNC_FUZZY_RE = re.compile(r'Action:\s*(\w+)\s*\(([^)]*)\)', re.IGNORECASE)
+# can_handle 提示词:忽略大小写的 C 级扫描,等价于 'action' in text.lower()
+# 但不为大文本分配小写副本
+_ACTION_HINT_RE = re.compile(r'action', re.IGNORECASE)
+# 修复预检:命中任一模式才说明文本里可能有待修复的尾随逗号/裸键名
+_TRAIL_COMMA_RE = re.compile(r',\s*[}\]]')
+_UNQUOTED_KEY_RE = re.compile(r'[{,]\s*\w+\s*:')
+
+
+def _is_ident_start(ch: str) -> bool:
+    return 'a' <= ch <= 'z' or 'A' <= ch <= 'Z' or ch == '_'
+
+
+def _skip_insignificant(s: str, j: int, n: int) -> int:
+    """从 j 起跳过空白与注释,返回下一个有效字符的下标"""
+    while j < n:
+        if s[j].isspace():
+            j += 1
+        elif s.startswith('//', j):
+            j = s.find('\n', j)
+            j = n if j == -1 else j + 1
+        elif s.startswith('/*', j):
+            end = s.find('*/', j + 2)
+            j = n if end == -1 else end + 2
+        else:
+            break
+    return j
+
+
+def _repair_json(json_str: str) -> str:
+    """
+    单遍扫描修复常见 JSON 错误:注释、尾随逗号、单引号、未引用的键
+
+    等价于之前的四次 re.sub 级联,但只遍历一次、只写一个输出缓冲;
+    并且区分字符串内外,字符串里的 // 和 ' 不再被误伤
+
+    先做廉价预检:文本里不含任何可修复的结构(单引号、注释、
+    尾随逗号、裸键名)时原样返回,常见的合法输入不进逐字符循环
+    """
+    if ("'" not in json_str and '//' not in json_str and '/*' not in json_str
+            and not _TRAIL_COMMA_RE.search(json_str)
+            and not _UNQUOTED_KEY_RE.search(json_str)):
+        return json_str
+    out = []
+    i, n = 0, len(json_str)
+    quote = ''     # 非空表示正处于字符串内,值为开引号字符
+    prev_sig = ''  # 最近输出的非空白字符,用于识别 { 或 , 之后的裸键名
+    while i < n:
+        ch = json_str[i]
+        if quote:
+            if ch == '\\' and i + 1 < n:  # 转义序列原样保留
+                out.append(ch)
+                out.append(json_str[i + 1])
+                i += 2
+                continue
+            if ch == quote:
+                quote = ''
+                ch = '"'
+            out.append(ch)
+            i += 1
+            continue
+        if ch == '/' and json_str.startswith('//', i):  # 单行注释
+            i = json_str.find('\n', i)
+            i = n if i == -1 else i
+            continue
+        if ch == '/' and json_str.startswith('/*', i):  # 多行注释
+            end = json_str.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        if ch == '"' or ch == "'":  # 单引号统一换成双引号
+            quote = ch
+            out.append('"')
+            prev_sig = '"'
+            i += 1
+            continue
+        if ch == ',':  # 尾随逗号:跳过空白和注释后只剩闭括号时丢弃
+            # 注释稍后才会被剥掉,这里的前瞻须把它当空白跳过,
+            # 否则 ", // 注释\n}" 的逗号会漏修
+            j = _skip_insignificant(json_str, i + 1, n)
+            if j < n and (json_str[j] == '}' or json_str[j] == ']'):
+                i += 1
+                continue
+        if _is_ident_start(ch) and (prev_sig == '{' or prev_sig == ','):
+            # 裸键名: { 或 , 后跟标识符再跟冒号时补上双引号
+            j = i + 1
+            while j < n and (_is_ident_start(json_str[j]) or json_str[j].isdigit()):
+                j += 1
+            k = j
+            while k < n and json_str[k].isspace():
+                k += 1
+            if k < n and json_str[k] == ':':
+                out.append('"' + json_str[i:j] + '"')
+                prev_sig = '"'
+                i = j
+                continue
+        out.append(ch)
+        if not ch.isspace():
+            prev_sig = ch
+        i += 1
+    return ''.join(out)
 
 
 class RobustActionParser(ParserStrategy):
@@ -14,7 +118,7 @@ class RobustActionParser(ParserStrategy):
     
     def can_handle(self, text: str) -> bool:
         """总是尝试处理(作为兜底策略)"""
-        return 'Action:' in text or 'action' in text.lower()
+        return _ACTION_HINT_RE.search(text) is not None
     
     def parse(self, text: str) -> Optional[Action]:
         """模糊解析"""
@@ -32,7 +136,7 @@ class RobustActionParser(ParserStrategy):
     
     def _parse_bracket_fuzzy(self, text: str) -> Optional[Action]:
         """模糊解析方括号格式"""
-        match = re.search(r'Action:\s*(\w+)\s*\[([^\]]*)\]', text, re.IGNORECASE)
+        match = _BRACKET_FUZZY_RE.search(text)
         if not match:
             return None
         
@@ -53,7 +157,7 @@ class RobustActionParser(ParserStrategy):
     
     def _parse_function_fuzzy(self, text: str) -> Optional[Action]:
         """模糊解析函数格式"""
-        match = re.search(r'Action:\s*(\w+)\s*\(([^)]*)\)', text, re.IGNORECASE)
+        match = _FUNC_FUZZY_RE.search(text)
         if not match:
             return None
         
@@ -68,12 +172,16 @@ class RobustActionParser(ParserStrategy):
         if params:
             return Action(name, params, match.group(0))
         
-        # 尝试 key=value 格式
+        # 尝试 key=value 格式(复用 bracket 解析器的预编译键值对正则,
+        # 引号里的逗号不会像 split(',') 那样被误拆)
         params = {}
-        for part in params_str.split(','):
-            if '=' in part:
-                key, val = part.split('=', 1)
-                params[key.strip()] = val.strip().strip('"\'')
+        for kv in _KV_RE.finditer(params_str):
+            val = kv.group(2)
+            if val is None:
+                val = kv.group(3)
+            if val is None:
+                val = kv.group(4)
+            params[kv.group(1)] = val.strip()
         
         if params:
             return Action(name, params, match.group(0))
@@ -89,36 +197,23 @@ class RobustActionParser(ParserStrategy):
         - 尾随逗号
         - 注释
         """
-        # 尝试直接解析
+        # 一字节嗅探:不像 JSON 容器的文本直接放弃,连异常都不用抛
+        stripped = text.lstrip()
+        if stripped[:1] not in ('{', '['):
+            return None
+        
+        # 尝试直接解析(合法输入走这条零正则路径)
         try:
-            return json.loads(text)
-        except:
+            return json_loads(stripped)
+        except ValueError:
             pass
         
         # 修复后解析
         try:
-            repaired = self._repair_json(text)
-            return json.loads(repaired)
-        except:
-            pass
-        
-        return None
+            return json_loads(self._repair_json(stripped))
+        except ValueError:
+            return None
     
     def _repair_json(self, json_str: str) -> str:
-        """修复常见 JSON 错误"""
-        # 移除单行注释
-        json_str = re.sub(r'//.*?$', '', json_str, flags=re.MULTILINE)
-        
-        # 移除多行注释
-        json_str = re.sub(r'/\*.*?\*/', '', json_str, flags=re.DOTALL)
-        
-        # 移除尾随逗号
-        json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-        
-        # 单引号 -> 双引号
-        json_str = json_str.replace("'", '"')
-        
-        # 修复未引用的键
-        json_str = re.sub(r'(\{|,)\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', json_str)
-        
-        return json_str
+        """修复常见 JSON 错误(委托给单遍扫描器)"""
+        return _repair_json(json_str)
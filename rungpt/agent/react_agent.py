@@ -1,14 +1,38 @@
 """ReAct Agent - 支持工具调用的 Agent"""
-from typing import Optional, Dict, Any, List
+import re
+from typing import Optional, Dict, Any, Iterator, List
 from .agent_base import AgentBase
 from .react_parser import ReActParser, Action
 from ..threads import Thread
-from ..tools import ToolRegistry
+from ..tools import ToolRegistry, ParallelToolExecutor
+
+# 模块级预编译:Final Answer 提取在 ReAct 循环每步都可能触发,
+# 不在调用时重建模式列表、不查 re 内部缓存
+_FINAL_ANSWER_PATTERNS = tuple(
+    re.compile(p, re.IGNORECASE | re.DOTALL)
+    for p in (
+        r'Final Answer:\s*(.*?)(?:\n|$)',
+        r'最终答案：\s*(.*?)(?:\n|$)',
+        r'Answer:\s*(.*?)(?:\n|$)',
+        r'答案：\s*(.*?)(?:\n|$)'
+    )
+)
+
+# 解析器无状态(内部共享同一个 ParserManager),所有 Agent 实例复用一个
+_DEFAULT_PARSER = ReActParser()
+
+# verbose 输出的分隔线;多行横幅合并为单次 print,
+# 每步只过一次 stdout 锁和一次系统调用
+_SEP = "=" * 70
 
 
 class ReActStep:
     """ReAct 循环的单步记录"""
     
+    # 小型记录对象,长会话会成百上千地分配:固定槽位省去每实例 __dict__
+    __slots__ = ("step_num", "thought", "action", "observation",
+                 "raw_response", "is_final", "final_answer")
+    
     def __init__(self, step_num: int):
         self.step_num = step_num
         self.thought: Optional[str] = None
@@ -27,21 +51,26 @@ class ReActAgent(AgentBase):
         system_prompt: str,
         model: str,
         tools: Optional[ToolRegistry] = None,
+        tool_concurrency: int = 1,
         **kwargs
     ):
         """
         初始化 ReAct Agent
-        
+
         Args:
             system_prompt: 系统提示词
             model: 模型名称（如 "gpt-4o"）
             tools: 工具注册表（可选，默认创建空的）
+            tool_concurrency: 单步内工具调用的最大并发数（>1 时并行执行独立工具调用）
             **kwargs: 其他参数（name, temperature, max_steps, memory, stream, verbose, debug等）
         """
         super().__init__(system_prompt, model, **kwargs)
         self.tools = tools or ToolRegistry()
-        self.parser = ReActParser()
+        self.tool_concurrency = tool_concurrency
+        self.tool_executor = ParallelToolExecutor(self.tools, max_workers=tool_concurrency)
+        self.parser = _DEFAULT_PARSER
         self.react_steps: List[ReActStep] = []
+        self._react_steps_cached: List[Dict[str, Any]] = []
         
         if self.stream and self.verbose:
             print("💬 ReActAgent 启用流式输出模式\n")
@@ -59,6 +88,7 @@ class ReActAgent(AgentBase):
         """
         thread.add_user(task)
         self.react_steps = []
+        self._react_steps_cached = []
         
         for step_num in range(1, self.profile.max_steps + 1):
             result = self._execute_step(step_num, thread)
@@ -73,25 +103,33 @@ class ReActAgent(AgentBase):
         current_step = ReActStep(step_num)
         
         if self.verbose:
-            print(f"\n{'='*70}")
-            print(f"🔄 Step {step_num}")
-            print(f"{'='*70}")
+            print(f"\n{_SEP}\n🔄 Step {step_num}\n{_SEP}")
         
         # 调用模型
-        response = self._call_model(thread)
+        # ReAct 的 Observation 由框架提供,模型输出中出现 "Observation:" 即幻觉,
+        # 流式模式下在该标记处提前断流,省去无用 token 的生成和等待
+        response = self._call_model(thread, stop_on="\nObservation:")
         current_step.raw_response = response
         
-        # 解析 Thought 和 Action
+        # 解析 Thought 和 Action(完成标记在同一次调用中顺带得到)
         thought = self.parser.extract_thought(response)
-        action = self.parser.parse(response)
-        
+        action, saw_finish = self.parser.parse_or_finish(response)
+
         if self.verbose and thought:
             print(f"💭 Thought: {thought}")
-        
+
+        # 单步多工具调用:并发执行独立的工具调用
+        if self.tool_concurrency > 1:
+            actions = self.parser.parse_all(response)
+            tool_actions = [a for a in actions if a.name != "FINISH"]
+            if len(tool_actions) >= 2:
+                self._handle_parallel_actions(tool_actions, thought, response, current_step, thread)
+                return None
+
         # 处理不同情况
         if action:
             return self._handle_action(action, thought, response, current_step, thread)
-        elif self.parser.has_finish(response):
+        elif saw_finish:
             return self._handle_finish(response, thought, current_step, thread)
         else:
             self._handle_error(response, thought, current_step, thread)
@@ -108,13 +146,11 @@ class ReActAgent(AgentBase):
             final_answer = action.params.get("answer", "")
             step.is_final = True
             step.final_answer = final_answer
-            self.react_steps.append(step)
+            self._record_step(step)
             
             if self.verbose:
-                print(f"⚡ Action: Finish[{final_answer[:50]}...]")
-                print(f"\n{'='*70}")
-                print(f"✅ Final Answer: {final_answer}")
-                print(f"{'='*70}\n")
+                print(f"⚡ Action: Finish[{final_answer[:50]}...]\n"
+                      f"\n{_SEP}\n✅ Final Answer: {final_answer}\n{_SEP}\n")
             
             thread.add_assistant(response)
             return final_answer
@@ -125,43 +161,67 @@ class ReActAgent(AgentBase):
         
         observation = self.tools.call(action.name, action.params)
         step.observation = observation
-        self.react_steps.append(step)
+        self._record_step(step)
         
         if self.verbose:
             print(f"👁️  Observation: {observation}")
         
-        thread.add_assistant(response)
-        thread.add_user(f"Observation: {observation}")
+        thread.extend([
+            {"role": "assistant", "content": response},
+            {"role": "user", "content": f"Observation: {observation}"}
+        ])
         return None
     
-    def _handle_finish(self, response: str, thought: Optional[str], 
+    def _handle_parallel_actions(self, actions: List[Action], thought: Optional[str],
+                                 response: str, step: ReActStep, thread: Thread) -> None:
+        """并发执行多个独立的工具调用,观察结果在主线程统一追加"""
+        if self.verbose:
+            for action in actions:
+                print(f"⚡ Action: {action.name}[{action.params}]")
+
+        results = self.tool_executor.execute(actions)
+
+        observations = []
+        for action, observation in results:
+            sub_step = ReActStep(step.step_num)
+            sub_step.thought = thought
+            sub_step.action = action
+            sub_step.observation = observation
+            self._record_step(sub_step)
+            observations.append(f"[{action.name}] {observation}")
+
+            if self.verbose:
+                print(f"👁️  Observation: [{action.name}] {observation}")
+
+        thread.extend([
+            {"role": "assistant", "content": response},
+            {"role": "user", "content": "Observation:\n" + "\n".join(observations)}
+        ])
+
+    def _handle_finish(self, response: str, thought: Optional[str],
                        step: ReActStep, thread: Thread) -> str:
         """处理 Final Answer(无 Action 格式)"""
         final_answer = self._extract_final_answer(response)
         step.is_final = True
         step.final_answer = final_answer
         step.thought = thought
-        self.react_steps.append(step)
+        self._record_step(step)
         
         if self.verbose:
-            print(f"\n{'='*70}")
-            print(f"✅ Final Answer: {final_answer}")
-            print(f"{'='*70}\n")
-        
+            print(f"\n{_SEP}\n✅ Final Answer: {final_answer}\n{_SEP}\n")
+
         thread.add_assistant(response)
         return final_answer
-    
+
     def _handle_error(self, response: str, thought: Optional[str], 
                       step: ReActStep, thread: Thread) -> None:
         """处理格式错误:插入引导消息"""
         if self.verbose:
-            print(f"⚠️  模型输出格式错误,未检测到 Action 或 Final Answer")
-            print(f"📝 插入引导消息,要求模型重新输出正确格式")
+            print("⚠️  模型输出格式错误,未检测到 Action 或 Final Answer\n"
+                  "📝 插入引导消息,要求模型重新输出正确格式")
         
         step.thought = thought
-        self.react_steps.append(step)
-        
-        thread.add_assistant(response)
+        self._record_step(step)
         
         guidance_message = (
             "你的输出格式不正确。请严格按照以下格式输出:\n\n"
@@ -173,13 +233,16 @@ class ReActAgent(AgentBase):
             "Action: FINISH[{\"answer\": \"你的最终答案\"}]\n\n"
             "请重新输出。"
         )
-        thread.add_user(guidance_message)
+        thread.extend([
+            {"role": "assistant", "content": response},
+            {"role": "user", "content": guidance_message}
+        ])
     
     def _force_finish(self, thread: Thread) -> str:
         """强制结束:达到最大步数"""
         if self.verbose:
-            print(f"\n⚠️  达到最大步数限制 ({self.profile.max_steps})")
-            print(f"📝 插入强制消息,要求agent总结并输出最终答案")
+            print(f"\n⚠️  达到最大步数限制 ({self.profile.max_steps})\n"
+                  f"📝 插入强制消息,要求agent总结并输出最终答案")
         
         force_message = (
             "你已经达到最大步数限制。请立即基于目前已有的所有信息和观察结果,总结并输出最终答案。\n\n"
@@ -194,32 +257,27 @@ class ReActAgent(AgentBase):
         final_response = self._call_model(thread)
         
         if self.verbose:
-            print(f"\n{'='*70}")
-            print(f"🔄 强制总结步骤")
-            print(f"{'='*70}")
+            print(f"\n{_SEP}\n🔄 强制总结步骤\n{_SEP}")
         
         # 尝试解析
         action = self.parser.parse(final_response)
         if action and action.name == "FINISH":
             final_answer = action.params.get("answer", "")
             if self.verbose:
-                print(f"✅ Final Answer: {final_answer}")
-                print(f"{'='*70}\n")
+                print(f"✅ Final Answer: {final_answer}\n{_SEP}\n")
             thread.add_assistant(final_response)
             return final_answer
         
         if self.parser.has_finish(final_response):
             final_answer = self._extract_final_answer(final_response)
             if self.verbose:
-                print(f"✅ Final Answer: {final_answer}")
-                print(f"{'='*70}\n")
+                print(f"✅ Final Answer: {final_answer}\n{_SEP}\n")
             thread.add_assistant(final_response)
             return final_answer
         
         # 兜底:返回原始响应
         if self.verbose:
-            print(f"⚠️  模型仍未按格式输出,返回原始响应")
-            print(f"{'='*70}\n")
+            print(f"⚠️  模型仍未按格式输出,返回原始响应\n{_SEP}\n")
         
         thread.add_assistant(final_response)
         return final_response
@@ -234,41 +292,46 @@ class ReActAgent(AgentBase):
         Returns:
             最终答案文本
         """
-        import re
-        
-        patterns = [
-            r'Final Answer:\s*(.*?)(?:\n|$)',
-            r'最终答案：\s*(.*?)(?:\n|$)',
-            r'Answer:\s*(.*?)(?:\n|$)',
-            r'答案：\s*(.*?)(?:\n|$)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, response, re.IGNORECASE | re.DOTALL)
+        for pattern in _FINAL_ANSWER_PATTERNS:
+            match = pattern.search(response)
             if match:
                 return match.group(1).strip()
         
         # 如果没有匹配到，返回整个响应
         return response.strip()
     
+    def _record_step(self, step: ReActStep) -> None:
+        """记录单步:顺带构建序列化形式,供外部轮询 O(1) 读取"""
+        self.react_steps.append(step)
+        self._react_steps_cached.append({
+            "step_num": step.step_num,
+            "thought": step.thought,
+            "action": {
+                "name": step.action.name,
+                "params": step.action.params
+            } if step.action else None,
+            "observation": step.observation,
+            "is_final": step.is_final,
+            "final_answer": step.final_answer
+        })
+    
     def get_react_steps(self) -> List[Dict[str, Any]]:
         """
         获取 ReAct 步骤记录
         
+        序列化在记录时已完成,这里只做浅拷贝;
+        监控/UI 高频轮询不再每次重建整个字典列表。
+        
         Returns:
             步骤记录列表
         """
-        return [
-            {
-                "step_num": step.step_num,
-                "thought": step.thought,
-                "action": {
-                    "name": step.action.name,
-                    "params": step.action.params
-                } if step.action else None,
-                "observation": step.observation,
-                "is_final": step.is_final,
-                "final_answer": step.final_answer
-            }
-            for step in self.react_steps
-        ]
+        return list(self._react_steps_cached)
+    
+    def iter_react_steps(self) -> Iterator[Dict[str, Any]]:
+        """
+        迭代 ReAct 步骤记录(单次遍历场景免去浅拷贝分配)
+        
+        Yields:
+            步骤记录字典
+        """
+        return iter(self._react_steps_cached)
@@ -7,6 +7,9 @@ from .parsers import ParserManager, Action as ParsedAction
 class Action:
     """执行动作（向后兼容包装）"""
     
+    # 每步都会分配的小对象:固定槽位省去每实例 __dict__
+    __slots__ = ("name", "params", "raw")
+    
     def __init__(self, name: str, params: dict, raw: str = ""):
         self.name = name
         self.params = params
@@ -16,6 +19,11 @@ class Action:
         return f"Action(name={self.name}, params={self.params})"
 
 
+# 策略本身无状态,进程内共享一个编排器即可,
+# 避免每次静态调用都重新实例化全部解析策略
+_SHARED_MANAGER = ParserManager()
+
+
 class ReActParser:
     """
     ReAct 格式解析器
@@ -29,8 +37,8 @@ class ReActParser:
     """
     
     def __init__(self):
-        """初始化解析器管理器"""
-        self._manager = ParserManager()
+        """初始化解析器管理器（共享无状态编排器）"""
+        self._manager = _SHARED_MANAGER
     
     @staticmethod
     def parse(text: str) -> Optional[Action]:
@@ -43,8 +51,10 @@ class ReActParser:
         Returns:
             Action 对象或 None
         """
-        parser = ReActParser()
-        return parser._parse(text)
+        parsed = _SHARED_MANAGER.parse(text)
+        if parsed:
+            return Action(parsed.name, parsed.params, parsed.raw)
+        return None
     
     def _parse(self, text: str) -> Optional[Action]:
         """内部解析方法"""
@@ -55,21 +65,42 @@ class ReActParser:
         return None
 
     
+    @staticmethod
+    def parse_all(text: str):
+        """
+        解析所有 Action(单步多工具调用场景)
+
+        Args:
+            text: 模型输出文本
+
+        Returns:
+            Action 列表
+        """
+        return [
+            Action(parsed.name, parsed.params, parsed.raw)
+            for parsed in _SHARED_MANAGER.parse_all(text)
+        ]
+
+    @staticmethod
+    def parse_or_finish(text: str):
+        """一次调用返回 (Action|None, 是否含完成标记)"""
+        parsed, finished = _SHARED_MANAGER.parse_or_finish(text)
+        if parsed:
+            return Action(parsed.name, parsed.params, parsed.raw), finished
+        return None, finished
+
     @staticmethod
     def has_finish(text: str) -> bool:
         """检查是否包含完成标记"""
-        parser = ReActParser()
-        return parser._manager.has_finish(text)
+        return _SHARED_MANAGER.has_finish(text)
     
     @staticmethod
     def extract_thought(text: str) -> Optional[str]:
         """提取思考过程"""
-        parser = ReActParser()
-        return parser._manager.extract_thought(text)
+        return _SHARED_MANAGER.extract_thought(text)
     
     @staticmethod
     def extract_observation(text: str) -> Optional[str]:
         """提取观察结果"""
-        parser = ReActParser()
-        return parser._manager.extract_observation(text)
+        return _SHARED_MANAGER.extract_observation(text)
 
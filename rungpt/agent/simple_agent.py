@@ -5,6 +5,13 @@ from .react_parser import ReActParser
 from ..threads import Thread
 from ..tools import ToolRegistry
 
+# 解析器无实例状态,进程内共享同一个,免去每个 Agent 的重复构建
+_DEFAULT_PARSER = ReActParser()
+
+# verbose 输出的分隔线;多行横幅合并为单次 print
+_SEP = "=" * 70
+_DASH = "─" * 70
+
 
 class SimpleAgent(AgentBase):
     """简单 Agent，直接生成文本输出，支持可选工具调用"""
@@ -27,7 +34,7 @@ class SimpleAgent(AgentBase):
         """
         super().__init__(system_prompt, model, **kwargs)
         self.tools = tools
-        self.parser = ReActParser() if tools else None
+        self.parser = _DEFAULT_PARSER if tools else None
         
         if self.verbose:
             print(f"🤖 SimpleAgent 初始化")
@@ -49,11 +56,8 @@ class SimpleAgent(AgentBase):
             生成的文本
         """
         if self.verbose:
-            print(f"{'='*70}")
-            print(f"🎯 SimpleAgent 执行任务")
-            print(f"{'='*70}")
-            print(f"📝 任务: {task}")
-            print(f"{'─'*70}\n")
+            print(f"{_SEP}\n🎯 SimpleAgent 执行任务\n{_SEP}\n"
+                  f"📝 任务: {task}\n{_DASH}\n")
         
         thread.add_user(task)
         
@@ -64,29 +68,22 @@ class SimpleAgent(AgentBase):
         response = self._call_model(thread)
         
         if self.verbose:
-            print(f"💬 模型回复: {response}\n")
-            print(f"{'─'*70}")
+            print(f"💬 模型回复: {response}\n\n{_DASH}")
         
         # 如果配置了工具，检测是否需要工具调用
         if self.tools and self.parser:
             action = self.parser.parse(response)
             if action:
                 if self.verbose:
-                    print(f"🔧 检测到工具调用")
-                    print(f"   工具: {action.name}")
-                    print(f"   参数: {action.params}")
-                    print(f"   执行中...")
+                    print(f"🔧 检测到工具调用\n   工具: {action.name}\n"
+                          f"   参数: {action.params}\n   执行中...")
                 
                 # 执行工具
                 tool_result = self.tools.call(action.name, action.params)
                 
                 if self.verbose:
-                    if "Error" in tool_result:
-                        print(f"   ❌ 执行失败")
-                    else:
-                        print(f"   ✅ 执行成功")
-                    print(f"   返回: {tool_result}")
-                    print(f"{'─'*70}\n")
+                    status = "❌ 执行失败" if "Error" in tool_result else "✅ 执行成功"
+                    print(f"   {status}\n   返回: {tool_result}\n{_DASH}\n")
                 
                 # 将工具结果加入对话，让模型生成最终答案
                 thread.add_assistant(response)
@@ -98,15 +95,13 @@ class SimpleAgent(AgentBase):
                 final_response = self._call_model(thread)
                 
                 if self.verbose:
-                    print(f"💬 最终答案: {final_response}\n")
-                    print(f"{'='*70}\n")
+                    print(f"💬 最终答案: {final_response}\n\n{_SEP}\n")
                 
                 thread.add_assistant(final_response)
                 return final_response
             else:
                 if self.verbose:
-                    print(f"ℹ️  未检测到工具调用，直接返回回答")
-                    print(f"{'='*70}\n")
+                    print(f"ℹ️  未检测到工具调用，直接返回回答\n{_SEP}\n")
         
         # 如果没有工具或没有检测到工具调用
         thread.add_assistant(response)
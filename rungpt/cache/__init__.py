@@ -0,0 +1,8 @@
+"""Cache - 模型响应缓存模块"""
+from .response_cache import ResponseCache
+from .disk_cache import DiskResponseCache
+
+__all__ = [
+    "ResponseCache",
+    "DiskResponseCache",
+]
@@ -0,0 +1,72 @@
+"""Disk Response Cache - 磁盘级模型响应缓存"""
+import json
+import os
+from typing import Optional
+
+from .response_cache import ResponseCache
+
+
+class DiskResponseCache(ResponseCache):
+    """
+    磁盘持久化的响应缓存
+
+    在内存缓存之上增加一层按键落盘的 JSON 文件存储,
+    使演示脚本/测试在进程重启后重放相同 Prompt 时仍然零 API 调用。
+
+    每个条目一个文件,文件名即缓存键（SHA-256）,无需额外依赖。
+    """
+
+    def __init__(self, cache_dir: str = ".rungpt_cache", max_entries: int = 1000):
+        """
+        初始化磁盘缓存
+
+        Args:
+            cache_dir: 缓存目录（不存在时自动创建）
+            max_entries: 内存层最大条目数（磁盘层不受此限制）
+        """
+        super().__init__(max_entries=max_entries)
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """缓存键对应的文件路径"""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """查询缓存:先查内存,未命中时回源磁盘"""
+        # 委托父类:内存命中同时刷新 LRU 序,热条目不会被批量写入挤掉
+        response = super().get(key)
+        if response is not None:
+            return response
+
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                response = json.load(f)["response"]
+        except (OSError, ValueError, KeyError):
+            return None  # 内存未命中已由父类记为一次 miss
+
+        # 回填内存层,后续命中无需再读盘;磁盘命中冲正父类记的 miss
+        super().set(key, response)
+        self.misses -= 1
+        self.hits += 1
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """写入缓存（内存 + 磁盘）"""
+        super().set(key, response)
+        try:
+            with open(self._path(key), "w", encoding="utf-8") as f:
+                json.dump({"response": response}, f, ensure_ascii=False)
+        except OSError:
+            # 落盘失败不影响主流程,内存层仍然可用
+            pass
+
+    def clear(self) -> None:
+        """清空缓存（内存 + 磁盘）"""
+        super().clear()
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
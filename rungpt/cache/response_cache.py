@@ -0,0 +1,88 @@
+"""Response Cache - 模型响应缓存"""
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
+
+from ..utils import json_dumps
+
+
+class ResponseCache:
+    """
+    内存级模型响应缓存（精确匹配）
+
+    以 (模型名, messages, 调用参数) 的哈希为键缓存完整响应。
+    对固定 Prompt 的重复调用（演示脚本重跑、测试回放等）可完全省去 API 调用。
+
+    注意: 命中缓存会跳过采样,temperature>0 时将失去输出多样性。
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        """
+        初始化响应缓存
+
+        Args:
+            max_entries: 最大缓存条目数（超出后淘汰最久未使用的条目）
+        """
+        self.max_entries = max_entries
+        self._store: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        """
+        生成缓存键
+
+        Args:
+            model_name: 模型名称
+            messages: 消息列表
+            params: 调用参数（temperature 等）
+
+        Returns:
+            确定性的哈希键
+        """
+        payload = json_dumps(
+            {"model": model_name, "messages": messages, "params": params},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """查询缓存,未命中返回 None"""
+        response = self._store.get(key)
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            # LRU:命中即移到末尾,反复使用的 Prompt 不会被批量写入挤掉
+            self._store.move_to_end(key)
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """写入缓存"""
+        if key not in self._store and len(self._store) >= self.max_entries:
+            # 淘汰最久未使用的条目
+            self._store.popitem(last=False)
+        self._store[key] = response
+        self._store.move_to_end(key)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._store.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计（含命中率）"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._store),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __repr__(self) -> str:
+        return f"ResponseCache(entries={len(self._store)}, hits={self.hits}, misses={self.misses})"
@@ -1,4 +1,6 @@
 """Context Manager - 上下文管理器（核心入口）"""
+import heapq
+import weakref
 from typing import List, Dict, Optional, Any
 from .prompt_template import PromptTemplate
 from .skill_injector import SkillInjector
@@ -8,7 +10,9 @@ from .token_manager import TokenManager
 
 class ContextManager:
     """上下文工程管理器 - 统一生成模型输入的 messages"""
-    
+
+    _shared: Optional["ContextManager"] = None
+
     def __init__(self, prompts_dir: Optional[str] = None):
         """
         初始化上下文管理器
@@ -20,6 +24,30 @@ class ContextManager:
         self.tool_injector = ToolInjector()
         self.skill_injector = SkillInjector()
         self.token_manager = TokenManager()
+        # 渲染后的静态系统前缀缓存:同一 Agent 的重复调用复用同一字符串,
+        # 保证前缀字节级一致(利于服务端 Prompt 缓存),也省去重复渲染
+        self._system_cache: Dict[Any, str] = {}
+        # 整体上下文缓存:按线程对象存放 (缓存键, messages),
+        # 线程版本与工具版本均未变化时跳过整个构建过程。
+        # 弱引用键按对象身份判等:线程被回收后条目自动清除,
+        # 既不会因 id 复用把旧线程的消息错配给新线程,也不会无限增长
+        self._context_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        # 记忆摘要缓存:每个记忆管理器存最近一个版本的 (版本号, 摘要),
+        # ReAct 多步循环里记忆未变时跳过扫描+排序+截取。
+        # 弱引用键理由同上:身份判等、随对象回收自动清除
+        self._memory_summary_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def shared(cls) -> "ContextManager":
+        """
+        返回进程级共享实例（默认模板目录）
+
+        ContextManager 不持有 Agent 级状态,所有输入都通过 build_context
+        参数传入;共享一个实例可以让模板/系统前缀/上下文缓存跨 Agent 复用。
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
     
     def build_context(
         self,
@@ -48,43 +76,144 @@ class ContextManager:
         Returns:
             格式化的 messages 列表
         """
-        # 1. 加载模板
-        template = self.prompt_template.load(agent_type)
-        
-        # 2. 准备变量（确保所有模板变量都有默认值）
-        variables = extra_vars or {}
-        
-        # 设置默认 System Prompt 如果未提供
-        if not system_prompt:
-            system_prompt = "你是一个有帮助的助手。"
-        variables['system_prompt'] = system_prompt
-        
-        # 3. 注入工具描述（无工具时为空字符串）
-        variables['tools'] = self.tool_injector.generate_react_format(tools) if tools else ""
-        
-        # 4. 注入技能（无技能时为空字符串）
-        variables['skills'] = self.skill_injector.generate(skills) if skills else ""
-        
-        # 5. 注入记忆摘要（无记忆时为空字符串）
-        variables['memory_summary'] = self._build_memory_summary(memory) if memory else ""
-        
-        # 6. 渲染 system prompt
-        system_prompt = self.prompt_template.render(template, variables)
-        
-        # 7. 构建 messages
+        # 0. 查询整体上下文缓存:配置未变时复用上次结果;线程只追加了新消息时
+        # 增量补齐尾部（ReAct 多步循环从每步 O(N) 重建降为 O(新消息数) 追加）
+        # memory 与 extra_vars 属于无版本号的动态输入,存在时不走缓存
+        # 鸭子类型探测统一用一次 getattr 取值,不做 hasattr+取值两次查找。
+        # 工具以渲染后的描述文本参与缓存键:按内容而非对象 id 判等,
+        # 注册表被回收、地址复用也不会错误命中(描述本身在注入器里有缓存)
+        config_key = None
+        if memory is None and not extra_vars and getattr(thread, 'version', None) is not None:
+            tools_key = self.tool_injector.generate_react_format(tools) if tools else ""
+            skills_key = tuple(skills) if skills else None
+            config_key = (agent_type, system_prompt, tools_key, skills_key, max_messages)
+            cached = self._cached_context(thread, config_key, max_messages)
+            if cached is not None:
+                return cached
+
+        # 1. 渲染静态系统前缀(带缓存)
+        system_prompt = self._render_system_prompt(
+            agent_type, system_prompt, tools, skills, extra_vars
+        )
+
+        # 2. 构建 messages
+        # 记忆摘要以独立的 user 消息注入在静态系统前缀之后:
+        # 系统提示词保持字节级稳定,不破坏服务端的自动 Prompt 前缀缓存
         messages = [{"role": "system", "content": system_prompt}]
-        
-        # 8. 添加历史消息（去掉 thread 中的旧 system）
-        if hasattr(thread, 'get_context'):
-            history = [m for m in thread.get_context() if m["role"] != "system"]
+
+        memory_summary = self._memory_summary_cached(memory) if memory else ""
+        if memory_summary:
+            messages.append({"role": "user", "content": memory_summary})
+
+        # 3. 添加历史消息（去掉 thread 中的旧 system）
+        get_context = getattr(thread, 'get_context', None)
+        if get_context is not None:
+            history = get_context()
+            # 线程里通常不含 system 消息:先廉价探测,无则免去一次过滤拷贝
+            if any(m["role"] == "system" for m in history):
+                history = [m for m in history if m["role"] != "system"]
             messages.extend(history)
-        
-        # 9. Token 裁剪
+
+        # 4. Token 裁剪
         if max_messages:
             messages = self.token_manager.truncate(messages, max_messages)
-        
+
+        # 写入整体缓存(存副本,避免调用方就地修改污染缓存)
+        if config_key is not None:
+            try:
+                self._context_cache[thread] = (
+                    config_key, thread.version, len(thread.messages), list(messages)
+                )
+            except TypeError:
+                pass  # 不支持弱引用的线程对象不进缓存
+
         return messages
-    
+
+    def _cached_context(self, thread, config_key, max_messages) -> Optional[List[Dict[str, str]]]:
+        """
+        查询并增量维护上下文缓存
+
+        线程版本一致时直接命中;线程自上次构建后仅追加了消息时,
+        把新尾部补进缓存后命中。其余情况返回 None 走完整构建。
+        """
+        entry = self._context_cache.get(thread)
+        if entry is None or entry[0] != config_key:
+            return None
+        _, version, msg_count, built = entry
+        if version == thread.version:
+            return list(built)
+        appended = len(thread.messages) - msg_count
+        # 版本增量与消息增量一致 => 期间只发生过追加(clear 会使二者不等)
+        if max_messages or appended <= 0 or thread.version != version + appended:
+            return None
+        built.extend(m for m in thread.get_context(appended) if m["role"] != "system")
+        self._context_cache[thread] = (
+            config_key, thread.version, len(thread.messages), built
+        )
+        return list(built)
+
+    def _render_system_prompt(
+        self,
+        agent_type: str,
+        system_prompt: Optional[str],
+        tools,
+        skills: Optional[List[str]],
+        extra_vars: Optional[Dict[str, Any]]
+    ) -> str:
+        """
+        渲染系统提示词（仅包含静态内容:模板 + 系统提示词 + 工具 + 技能）
+
+        静态前缀按 (agent_type, system_prompt, 工具版本, 技能) 缓存;
+        extra_vars 属于动态输入,存在时不走缓存。
+        """
+        if not system_prompt:
+            system_prompt = "你是一个有帮助的助手。"
+
+        # 工具描述以内容参与缓存键(理由同 build_context 的 config_key)
+        tools_desc = self.tool_injector.generate_react_format(tools) if tools else ""
+
+        cache_key = None
+        if not extra_vars:
+            skills_key = tuple(skills) if skills else None
+            cache_key = (agent_type, system_prompt, tools_desc, skills_key)
+            cached = self._system_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # 加载模板并准备变量（确保所有模板变量都有默认值）
+        template = self.prompt_template.load(agent_type)
+        variables = dict(extra_vars) if extra_vars else {}
+        variables['system_prompt'] = system_prompt
+
+        # 注入工具描述（无工具时为空字符串）
+        variables['tools'] = tools_desc
+
+        # 注入技能（无技能时为空字符串）
+        variables['skills'] = self.skill_injector.generate(skills) if skills else ""
+
+        # 记忆属于动态内容,以独立消息注入,不渲染进系统提示词
+        variables['memory_summary'] = ""
+
+        rendered = self.prompt_template.render(template, variables)
+        if cache_key is not None:
+            self._system_cache[cache_key] = rendered
+        return rendered
+
+    def _memory_summary_cached(self, memory) -> str:
+        """记忆版本未变时复用上次生成的摘要文本"""
+        version = getattr(memory, 'version', None)
+        if version is None:
+            return self._build_memory_summary(memory)
+        entry = self._memory_summary_cache.get(memory)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        summary = self._build_memory_summary(memory)
+        try:
+            self._memory_summary_cache[memory] = (version, summary)
+        except TypeError:
+            pass  # 不支持弱引用的记忆对象不缓存
+        return summary
+
     def _build_memory_summary(self, memory) -> str:
         """
         从 Memory 生成摘要文本
@@ -95,22 +224,25 @@ class ContextManager:
         Returns:
             记忆摘要文本
         """
-        if not memory or not hasattr(memory, 'get_summary'):
+        get_summary = getattr(memory, 'get_summary', None)
+        if not memory or get_summary is None:
             return ""
-        
-        summary = memory.get_summary()
+
+        summary = get_summary()
         if not summary or summary.get('total_memories', 0) == 0:
             return ""
         
         parts = ["[记忆上下文]"]
         
         # 简单版本：列出最近的记忆
-        if hasattr(memory, 'memories'):
-            recent = sorted(
-                memory.memories.values(),
-                key=lambda m: m.updated_at,
-                reverse=True
-            )[:5]  # 最近5条
+        # 只取最近 5 条,nlargest 是 O(N) 而非全量排序的 O(N log N)
+        memories = getattr(memory, 'memories', None)
+        if memories is not None:
+            recent = heapq.nlargest(
+                5,
+                memories.values(),
+                key=lambda m: m.updated_at
+            )
             
             for mem in recent:
                 parts.append(f"  - {mem.key}: {str(mem.value)[:50]}")
@@ -1,14 +1,40 @@
 """Tool Injector - 工具描述注入器"""
+import weakref
 from typing import Optional
 
 
 class ToolInjector:
     """工具描述生成器"""
-    
+
+    def __init__(self):
+        # 描述缓存:工具描述只依赖注册表内容,每个注册表缓存
+        # 最近一个版本的 (版本号, 描述),避免每次 build_context
+        # 都重新遍历工具和参数 Schema。
+        # 弱引用键按对象身份判等:注册表被回收后条目自动清除,
+        # 不会因 id 复用把旧注册表的描述错配给新注册表,也不会累积旧版本
+        self._cache = weakref.WeakKeyDictionary()
+
     def generate_react_format(self, tools) -> str:
         """生成 ReAct 格式的工具描述（包含参数信息）"""
         if not tools or not hasattr(tools, 'list_tools'):
             return "可用工具：无"
+
+        version = getattr(tools, 'version', None)
+        if version is not None:
+            entry = self._cache.get(tools)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+
+        desc = self._generate(tools)
+        if version is not None:
+            try:
+                self._cache[tools] = (version, desc)
+            except TypeError:
+                pass  # 不支持弱引用的注册表对象不缓存
+        return desc
+
+    def _generate(self, tools) -> str:
+        """实际生成工具描述文本"""
         
         tool_names = tools.list_tools()
         if not tool_names:
@@ -1,5 +1,6 @@
 """Model Interface - 定义统一的模型调用接口"""
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
 
@@ -38,6 +39,37 @@ class ModelInterface(ABC):
         """
         pass
     
+    def batch_run(
+        self,
+        messages_list: List[List[Dict[str, str]]],
+        max_workers: int = 4,
+        **kwargs
+    ) -> List[str]:
+        """
+        批量执行多组独立的模型推理
+
+        默认实现通过线程池并发发起请求,N 组消息的总耗时从 N×RTT
+        降为约 1×RTT;Provider 可重写以利用服务端的原生批量能力。
+
+        Args:
+            messages_list: 消息列表的列表,每组独立推理
+            max_workers: 最大并发请求数
+            **kwargs: 其他参数（如 temperature, max_tokens 等）
+
+        Returns:
+            List[str]: 与 messages_list 顺序一致的返回内容列表
+        """
+        if len(messages_list) <= 1:
+            return [self.run(messages, **kwargs) for messages in messages_list]
+
+        workers = min(len(messages_list), max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.run, messages, **kwargs)
+                for messages in messages_list
+            ]
+            return [future.result() for future in futures]
+
     def get_model_info(self) -> Dict[str, Any]:
         """获取模型信息"""
         return {
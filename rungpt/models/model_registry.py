@@ -1,4 +1,5 @@
 """Model Registry - 模型注册表与加载管理"""
+import threading
 from typing import Dict, Type, Optional, Any
 from .model_interface import ModelInterface
 from .unified_provider import UnifiedProvider
@@ -44,6 +45,11 @@ class ModelRegistry:
 # 注册默认的 UnifiedProvider
 ModelRegistry.register("unified", UnifiedProvider)
 
+# 模型实例缓存:Provider 实例无会话状态,同一配置只需实例化一次
+# （多个 Agent 共用同一 model_name 时省去重复读取环境变量/构造客户端）
+_model_cache: Dict[Any, ModelInterface] = {}
+_model_cache_lock = threading.Lock()
+
 
 def load_model(
     provider: str = "unified",
@@ -51,7 +57,7 @@ def load_model(
     **config
 ) -> ModelInterface:
     """
-    加载模型实例
+    加载模型实例（同一配置返回共享实例）
     
     Args:
         provider: Provider 名称，默认 "unified"
@@ -65,6 +71,24 @@ def load_model(
         model = load_model("unified", model_name="deepseek-r1")
         response = model.run([{"role": "user", "content": "Hello"}])
     """
-    provider_class = ModelRegistry.get_provider(provider)
-    return provider_class(model_name=model_name, **config)
+    try:
+        cache_key = (provider, model_name, tuple(sorted(config.items())))
+        # 构造元组不会触碰值的哈希,这里主动哈希一次:
+        # 配置含 list/dict 等不可哈希值时在护栏内暴露,而非命中缓存时才炸
+        hash(cache_key)
+    except TypeError:
+        # 配置包含不可哈希的值,跳过缓存
+        cache_key = None
+
+    if cache_key is None:
+        provider_class = ModelRegistry.get_provider(provider)
+        return provider_class(model_name=model_name, **config)
+
+    with _model_cache_lock:
+        model = _model_cache.get(cache_key)
+        if model is None:
+            provider_class = ModelRegistry.get_provider(provider)
+            model = provider_class(model_name=model_name, **config)
+            _model_cache[cache_key] = model
+        return model
 
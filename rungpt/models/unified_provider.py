@@ -9,6 +9,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# 进程级共享 HTTP 会话:通过 keep-alive 复用 TCP+TLS 连接,
+# 并发 fan-out 时 N 个请求共享同一个连接池,省去每次调用的握手开销
+_session = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=100)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
 
 class UnifiedProvider(ModelInterface):
     """统一模型提供者，封装第三方统一模型平台"""
@@ -77,9 +84,9 @@ class UnifiedProvider(ModelInterface):
                 payload = self._build_payload(messages, stream=False, **kwargs)
                 headers = self._build_headers()
                 
-                logger.debug(f"发起 LLM 请求，超时时间: {self.timeout}s")
+                logger.debug("发起 LLM 请求，超时时间: %ss", self.timeout)
                 
-                response = requests.post(self.endpoint, headers=headers, json=payload, timeout=self.timeout)
+                response = _session.post(self.endpoint, headers=headers, json=payload, timeout=self.timeout)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -94,14 +101,15 @@ class UnifiedProvider(ModelInterface):
                 # 网络相关错误：重试
                 if attempt < max_retries - 1:
                     logger.warning(
-                        f"网络错误 (尝试 {attempt + 1}/{max_retries}): {e.__class__.__name__}: {e}"
+                        "网络错误 (尝试 %d/%d): %s: %s",
+                        attempt + 1, max_retries, e.__class__.__name__, e
                     )
-                    logger.info(f"等待 {retry_delay:.1f} 秒后重试...")
+                    logger.info("等待 %.1f 秒后重试...", retry_delay)
                     time.sleep(retry_delay)
                     retry_delay *= 2  # 指数退避
                 else:
                     # 最后一次尝试也失败
-                    logger.error(f"网络错误，已达最大重试次数 ({max_retries})")
+                    logger.error("网络错误，已达最大重试次数 (%d)", max_retries)
                     raise TimeoutError(f"模型调用超时（重试 {max_retries} 次后失败）: {e}")
             
             except requests.exceptions.HTTPError as e:
@@ -137,9 +145,9 @@ class UnifiedProvider(ModelInterface):
                 payload = self._build_payload(messages, stream=True, **kwargs)
                 headers = self._build_headers()
                 
-                logger.debug(f"发起流式 LLM 请求，超时时间: {self.timeout}s")
+                logger.debug("发起流式 LLM 请求，超时时间: %ss", self.timeout)
                 
-                response = requests.post(self.endpoint, headers=headers, json=payload, stream=True, timeout=self.timeout)
+                response = _session.post(self.endpoint, headers=headers, json=payload, stream=True, timeout=self.timeout)
                 response.raise_for_status()
                 
                 # 成功建立连接，开始流式传输
@@ -174,14 +182,15 @@ class UnifiedProvider(ModelInterface):
                     # 流式传输过程中的网络错误
                     if attempt < max_retries - 1:
                         logger.warning(
-                            f"流式传输中断 (尝试 {attempt + 1}/{max_retries}): ChunkedEncodingError"
+                            "流式传输中断 (尝试 %d/%d): ChunkedEncodingError",
+                            attempt + 1, max_retries
                         )
-                        logger.info(f"等待 {retry_delay:.1f} 秒后重试...")
+                        logger.info("等待 %.1f 秒后重试...", retry_delay)
                         time.sleep(retry_delay)
                         retry_delay *= 2
                         continue
                     else:
-                        logger.error(f"流式传输失败，已达最大重试次数 ({max_retries})")
+                        logger.error("流式传输失败，已达最大重试次数 (%d)", max_retries)
                         return
                 except Exception:
                     # 其他流式传输错误，直接返回
@@ -192,13 +201,14 @@ class UnifiedProvider(ModelInterface):
                 # 建立连接阶段的网络错误：重试
                 if attempt < max_retries - 1:
                     logger.warning(
-                        f"流式连接失败 (尝试 {attempt + 1}/{max_retries}): {e.__class__.__name__}: {e}"
+                        "流式连接失败 (尝试 %d/%d): %s: %s",
+                        attempt + 1, max_retries, e.__class__.__name__, e
                     )
-                    logger.info(f"等待 {retry_delay:.1f} 秒后重试...")
+                    logger.info("等待 %.1f 秒后重试...", retry_delay)
                     time.sleep(retry_delay)
                     retry_delay *= 2
                 else:
-                    logger.error(f"流式连接失败，已达最大重试次数 ({max_retries})")
+                    logger.error("流式连接失败，已达最大重试次数 (%d)", max_retries)
                     raise RuntimeError(f"流式模型调用失败（重试 {max_retries} 次后失败）: {e}")
             
             except requests.exceptions.HTTPError as e:
@@ -210,6 +220,36 @@ class UnifiedProvider(ModelInterface):
                 raise RuntimeError(f"流式模型调用失败: {e}")
 
     
+    def batch_run(
+        self,
+        messages_list: List[List[Dict[str, str]]],
+        max_workers: int = 4,
+        **kwargs
+    ) -> List[str]:
+        """
+        批量执行模型推理
+
+        所有消息完全相同时（自一致性采样等多样本场景）合并为一次 n=N 请求:
+        服务端共享同一份 Prompt 预填充,只收一次请求开销;
+        其余情况回退到基类的并发独立请求。
+        """
+        n = len(messages_list)
+        if n > 1 and all(m == messages_list[0] for m in messages_list[1:]):
+            try:
+                payload = self._build_payload(messages_list[0], stream=False, n=n, **kwargs)
+                response = _session.post(
+                    self.endpoint, headers=self._build_headers(),
+                    json=payload, timeout=self.timeout
+                )
+                response.raise_for_status()
+                choices = response.json().get("choices", [])
+                if len(choices) == n:
+                    return [c["message"]["content"] for c in choices]
+                logger.warning("n=%d 请求仅返回 %d 个结果,回退为并发独立请求", n, len(choices))
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                logger.warning("n=%d 批量请求失败,回退为并发独立请求: %s", n, e)
+        return super().batch_run(messages_list, max_workers=max_workers, **kwargs)
+
     def get_model_info(self) -> Dict[str, Any]:
         """获取模型信息"""
         info = super().get_model_info()
@@ -34,10 +34,16 @@ class MemoryManager:
     """记忆管理器 - 维护短期任务记忆"""
     
     def __init__(self, max_memories: int = 1000, max_threads: int = 100):
+        # memories 按"最久未更新在前"维护插入顺序,淘汰时直接弹出首个条目
         self.memories: Dict[str, Memory] = {}
+        # 分类倒排索引: category -> {key: Memory},按分类回忆为 O(1)
+        self._by_category: Dict[str, Dict[str, Memory]] = {}
         self.thread_history: Dict[str, Thread] = {}
         self.max_memories = max_memories
         self.max_threads = max_threads
+        # 内容版本号:记忆增删改时递增,供上下文层做"未变化即复用"判断
+        # (与 Thread.version 同一机制)
+        self.version = 0
     
     def store(self, key: str, value: Any, category: str = "default") -> None:
         """
@@ -49,12 +55,43 @@ class MemoryManager:
             category: 记忆分类
         """
         if key in self.memories:
-            self.memories[key].update(value)
+            # 移到末尾保持 LRU 顺序,再更新值
+            mem = self.memories.pop(key)
+            mem.update(value)
+            self.memories[key] = mem
         else:
             if len(self.memories) >= self.max_memories:
-                oldest = min(self.memories.values(), key=lambda m: m.updated_at)
-                del self.memories[oldest.key]
-            self.memories[key] = Memory(key, value, category)
+                # 首个条目即最久未更新,O(1) 淘汰
+                oldest_key = next(iter(self.memories))
+                self._remove(oldest_key)
+            mem = Memory(key, value, category)
+            self.memories[key] = mem
+            self._by_category.setdefault(category, {})[key] = mem
+        self.version += 1
+
+    def store_many(self, items, category: str = "default") -> None:
+        """
+        批量存储记忆
+        
+        Args:
+            items: (key, value) 二元组的可迭代对象
+            category: 统一的记忆分类
+        
+        内存后端下等价于逐条 store;保留批量入口是为了让
+        磁盘/远端后端可以用一次往返写完整批,调用方无需改动。
+        """
+        for key, value in items:
+            self.store(key, value, category)
+    
+    def _remove(self, key: str) -> None:
+        """删除记忆并同步分类索引"""
+        self.version += 1
+        mem = self.memories.pop(key)
+        cat_index = self._by_category.get(mem.category)
+        if cat_index is not None:
+            cat_index.pop(key, None)
+            if not cat_index:
+                del self._by_category[mem.category]
     
     def recall(self, key: str, default: Any = None) -> Any:
         """
@@ -81,9 +118,8 @@ class MemoryManager:
             该分类下的所有记忆
         """
         return {
-            k: m.value 
-            for k, m in self.memories.items() 
-            if m.category == category
+            k: m.value
+            for k, m in self._by_category.get(category, {}).items()
         }
     
     def forget(self, key: str) -> bool:
@@ -97,7 +133,7 @@ class MemoryManager:
             是否成功遗忘
         """
         if key in self.memories:
-            del self.memories[key]
+            self._remove(key)
             return True
         return False
     
@@ -109,11 +145,12 @@ class MemoryManager:
             category: 可选，仅清空指定分类
         """
         if category:
-            to_remove = [k for k, m in self.memories.items() if m.category == category]
-            for k in to_remove:
-                del self.memories[k]
+            for k in list(self._by_category.get(category, {})):
+                self._remove(k)
         else:
             self.memories.clear()
+            self._by_category.clear()
+            self.version += 1
     
     def save_thread(self, thread: Thread) -> None:
         """保存线程到历史"""
@@ -132,11 +169,8 @@ class MemoryManager:
     
     def get_summary(self) -> Dict[str, Any]:
         """获取记忆摘要"""
-        categories = {}
-        for mem in self.memories.values():
-            cat = mem.category
-            categories[cat] = categories.get(cat, 0) + 1
-        
+        categories = {cat: len(items) for cat, items in self._by_category.items()}
+
         return {
             "total_memories": len(self.memories),
             "categories": categories,
@@ -164,6 +198,7 @@ class MemoryManager:
             mem.created_at = datetime.fromisoformat(m_data["created_at"])
             mem.updated_at = datetime.fromisoformat(m_data["updated_at"])
             mgr.memories[k] = mem
+            mgr._by_category.setdefault(mem.category, {})[k] = mem
         
         for k, t_data in data.get("thread_history", {}).items():
             mgr.thread_history[k] = Thread.from_dict(t_data)
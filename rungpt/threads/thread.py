@@ -6,11 +6,27 @@ from datetime import datetime
 class Thread:
     """轻量级对话线程，维护消息历史和上下文"""
     
-    def __init__(self, thread_id: Optional[str] = None):
+    def __init__(self, thread_id: Optional[str] = None, max_context_msgs: Optional[int] = None):
+        """
+        Args:
+            thread_id: 线程 ID（可选，默认自动生成）
+            max_context_msgs: 模型上下文的滚动窗口上限（可选）。超过后较早的
+                消息折叠为一条摘要,发给模型的内容保持 O(窗口) 而非 O(历史);
+                完整历史仍保存在 messages 中,不受影响
+        """
         self.id = thread_id or self._gen_id()
         self.messages: List[Dict[str, Any]] = []
         self.metadata: Dict[str, Any] = {}
         self.created_at = datetime.now()
+        # get_context 的增量缓存:与 messages 同步追加,避免每次调用重建投影
+        self._context: List[Dict[str, str]] = []
+        # 最近一条用户消息的下标(-1 表示尚无用户消息)
+        self._last_user_index: int = -1
+        # 单调递增的版本号,消息变动时 +1,供上层缓存判断线程是否变化
+        self.version: int = 0
+        self.max_context_msgs = max_context_msgs
+        # 已折叠进摘要的历史消息数
+        self._folded_count: int = 0
     
     def _gen_id(self) -> str:
         """生成线程ID"""
@@ -32,7 +48,33 @@ class Thread:
             **kwargs
         }
         self.messages.append(msg)
-    
+        self._context.append({"role": role, "content": content})
+        self.version += 1
+        if role == "user":
+            self._last_user_index = len(self.messages) - 1
+        if self.max_context_msgs and len(self._context) > self.max_context_msgs:
+            self._compress_context()
+    
+    def extend(self, messages: List[Dict[str, str]]) -> None:
+        """
+        批量追加消息(ReAct 每步的 助手回复+Observation 成对写入场景)
+
+        整批共享一次时间戳,窗口压缩检查只做一次。版本号仍按条数递增,
+        维持上层上下文缓存 "版本增量 == 追加条数" 的纯追加判断。
+
+        Args:
+            messages: 消息列表,每条至少含 role 和 content
+        """
+        timestamp = datetime.now().isoformat()
+        for m in messages:
+            self.messages.append({**m, "timestamp": timestamp})
+            self._context.append({"role": m["role"], "content": m["content"]})
+            if m["role"] == "user":
+                self._last_user_index = len(self.messages) - 1
+        self.version += len(messages)
+        if self.max_context_msgs and len(self._context) > self.max_context_msgs:
+            self._compress_context()
+
     def add_user(self, content: str, **kwargs) -> None:
         """添加用户消息"""
         self.add_message("user", content, **kwargs)
@@ -73,12 +115,47 @@ class Thread:
         Returns:
             格式化的消息列表
         """
-        msgs = self.messages[-max_msgs:] if max_msgs else self.messages
-        return [{"role": m["role"], "content": m["content"]} for m in msgs]
+        # 直接返回增量维护的投影切片,每轮对话成本从 O(N) 降为 O(1) 追加
+        if max_msgs:
+            return self._context[-max_msgs:]
+        return self._context.copy()
     
+    def _compress_context(self) -> None:
+        """
+        压缩模型上下文:较早消息折叠为一条摘要,保留最近的半个窗口
+
+        只收缩 get_context 的投影,messages 里的完整历史原样保留。
+        保留半窗是为了留出迟滞区间,避免之后每追加一条就压缩一次。
+        额外递增版本号,让上层的上下文缓存感知到这不是纯追加。
+        """
+        keep = max(self.max_context_msgs // 2, 1)
+        start = 1 if self._folded_count else 0  # 首位是上一条摘要
+        self._folded_count += len(self._context) - keep - start
+        summary = {
+            "role": "user",
+            "content": f"[上下文摘要] 较早的 {self._folded_count} 条消息已折叠,以下仅保留最近对话。"
+        }
+        self._context = [summary] + self._context[-keep:]
+        self.version += 1
+
+    def last_user_message(self) -> Optional[str]:
+        """
+        获取最近一条用户消息的内容（O(1)）
+
+        Returns:
+            消息内容，无用户消息时返回 None
+        """
+        if self._last_user_index < 0:
+            return None
+        return self.messages[self._last_user_index]["content"]
+
     def clear(self) -> None:
         """清空消息历史"""
         self.messages.clear()
+        self._context.clear()
+        self.version += 1
+        self._last_user_index = -1
+        self._folded_count = 0
     
     def set_meta(self, key: str, value: Any) -> None:
         """设置元数据"""
@@ -102,6 +179,13 @@ class Thread:
         """从字典恢复"""
         thread = cls(thread_id=data["id"])
         thread.messages = data["messages"]
+        thread._context = [
+            {"role": m["role"], "content": m["content"]} for m in thread.messages
+        ]
+        thread.version = len(thread.messages)
+        for i, m in enumerate(thread.messages):
+            if m["role"] == "user":
+                thread._last_user_index = i
         thread.metadata = data["metadata"]
         thread.created_at = datetime.fromisoformat(data["created_at"])
         return thread
@@ -2,11 +2,13 @@
 from .tool import Tool, extract_function_schema as extract_schema
 from .registry import ToolRegistry
 from .result import ToolResult
+from .parallel import ParallelToolExecutor
 
 __all__ = [
     "Tool",
     "ToolRegistry",
     "extract_schema",
     "ToolResult",
+    "ParallelToolExecutor",
 ]
 
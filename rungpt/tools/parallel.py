@@ -0,0 +1,52 @@
+"""Parallel Tool Executor - 并行工具执行器"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Any
+
+from .registry import ToolRegistry
+
+
+class ParallelToolExecutor:
+    """
+    并行工具执行器
+
+    当模型在单个步骤中输出多个独立的工具调用时,
+    使用线程池并发执行,将总延迟从 Σ(各工具耗时) 降低为 max(各工具耗时)。
+
+    注意: 仅适用于相互独立的工具调用(I/O 密集型场景收益最大)。
+    """
+
+    def __init__(self, registry: ToolRegistry, max_workers: int = 4):
+        """
+        初始化并行执行器
+
+        Args:
+            registry: 工具注册表
+            max_workers: 最大并发线程数
+        """
+        self.registry = registry
+        self.max_workers = max_workers
+
+    def execute(self, actions: List[Any]) -> List[Tuple[Any, str]]:
+        """
+        并发执行一组工具调用
+
+        Args:
+            actions: Action 列表(每个包含 name 和 params)
+
+        Returns:
+            [(action, observation), ...] 按提交顺序返回,保证观察结果顺序稳定
+        """
+        if len(actions) == 1:
+            action = actions[0]
+            return [(action, self.registry.call(action.name, action.params))]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self.registry.call, action.name, action.params)
+                for action in actions
+            ]
+            # 按提交顺序收集结果,保证观察结果与 Action 一一对应
+            return [
+                (action, future.result())
+                for action, future in zip(actions, futures)
+            ]
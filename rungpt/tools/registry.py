@@ -15,6 +15,13 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: Dict[str, Tool] = {}
+        # 版本号:注册表每次变更时递增,供上层缓存(如工具描述生成)做失效判断
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """注册表版本号（每次增删/启停工具时递增）"""
+        return self._version
     
     def register(self, name: str, func: Callable, description: str = "", 
                  schema: Optional[Dict[str, Any]] = None) -> None:
@@ -33,6 +40,7 @@ class ToolRegistry:
         """
         tool = Tool(name=name, func=func, description=description)
         self._tools[name] = tool
+        self._version += 1
     
     def register_tool(self, tool: Tool) -> None:
         """
@@ -46,6 +54,7 @@ class ToolRegistry:
             tools.register_tool(tool)
         """
         self._tools[tool.name] = tool
+        self._version += 1
     
     def tool(self, name: str = None, description: str = "", **kwargs):
         """
@@ -70,12 +79,14 @@ class ToolRegistry:
             # 这里的 description 和 kwargs 应该是空的或默认值
             tool = Tool(name=tool_name, func=func, description=description, **kwargs)
             self._tools[tool_name] = tool
+            self._version += 1
             return func
 
         def decorator(func):
             tool_name = name or func.__name__
             tool = Tool(name=tool_name, func=func, description=description, **kwargs)
             self._tools[tool_name] = tool
+            self._version += 1
             return func
         return decorator
     
@@ -111,6 +122,18 @@ class ToolRegistry:
     def list_tools(self) -> List[str]:
         """列出所有工具名称"""
         return list(self._tools.keys())
+
+    def iter_tools(self):
+        """
+        迭代所有 (名称, 工具) 对
+
+        避免 list_tools() 之后再逐个 get_tool() 的二次哈希查找
+
+        Example:
+            for name, tool in registry.iter_tools():
+                print(name, tool.description)
+        """
+        return self._tools.items()
     
     def get_schemas(self) -> Dict[str, Dict[str, Any]]:
         """获取所有工具的 Schema"""
@@ -121,6 +144,7 @@ class ToolRegistry:
         tool = self._tools.get(name)
         if tool:
             tool.enabled = True
+            self._version += 1
             return True
         return False
     
@@ -129,6 +153,7 @@ class ToolRegistry:
         tool = self._tools.get(name)
         if tool:
             tool.enabled = False
+            self._version += 1
             return True
         return False
     
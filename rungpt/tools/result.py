@@ -1,7 +1,8 @@
 """Tool Result - 标准化工具返回对象"""
 from dataclasses import dataclass
 from typing import Any, Optional
-import json
+
+from ..utils import json_dumps
 
 
 @dataclass
@@ -22,7 +23,7 @@ class ToolResult:
         """转换为 LLM 友好的字符串格式"""
         if self.success:
             if isinstance(self.data, (dict, list)):
-                return json.dumps({"success": True, "data": self.data}, ensure_ascii=False, indent=2)
+                return json_dumps({"success": True, "data": self.data}, indent=True)
             return f"Success: {self.data}"
         return f"Error: {self.error}"
     
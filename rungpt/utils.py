@@ -0,0 +1,102 @@
+"""Utils - 通用工具函数"""
+
+# JSON 序列化:优先使用 C 实现的 orjson（可选依赖,pip install orjson）,
+# 未安装时回退到标准库 json,调用方无感知
+try:
+    import orjson as _orjson
+
+    def json_dumps(obj, sort_keys: bool = False, indent: bool = False, default=None) -> str:
+        """序列化为 JSON 字符串（orjson 实现）"""
+        option = 0
+        if sort_keys:
+            option |= _orjson.OPT_SORT_KEYS
+        if indent:
+            option |= _orjson.OPT_INDENT_2
+        return _orjson.dumps(obj, default=default, option=option).decode("utf-8")
+
+    def json_loads(text):
+        """解析 JSON 字符串（orjson 实现）"""
+        return _orjson.loads(text)
+
+except ImportError:
+    import json as _json
+
+    def json_dumps(obj, sort_keys: bool = False, indent: bool = False, default=None) -> str:
+        """序列化为 JSON 字符串（标准库实现）"""
+        return _json.dumps(
+            obj,
+            ensure_ascii=False,
+            sort_keys=sort_keys,
+            indent=2 if indent else None,
+            default=default
+        )
+
+    def json_loads(text):
+        """解析 JSON 字符串（标准库实现）"""
+        return _json.loads(text)
+
+
+async def run_in_thread(func, *args):
+    """
+    把同步调用卸载到默认线程池并等待结果
+
+    asyncio.to_thread 要求 Python 3.9,本项目最低支持 3.8,
+    统一经由 run_in_executor 获得同样的卸载语义。
+
+    Args:
+        func: 同步可调用对象
+        *args: 按位置传入的参数
+
+    Returns:
+        func(*args) 的返回值
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, func, *args)
+
+
+def enable_async_logging(level: int = None) -> "logging.handlers.QueueListener":
+    """
+    为 rungpt 启用异步日志:热路径只向内存队列投递,写出在后台线程完成
+
+    logging 默认在调用线程里持锁格式化并写 stderr,重试/工作流等
+    高频日志点会在每条日志上付一次 I/O。本函数给 "rungpt" 记录器挂上
+    QueueHandler,由 QueueListener 在独立线程消费并写出。
+
+    Args:
+        level: 日志级别（可选,默认 logging.INFO）
+
+    Returns:
+        已启动的 QueueListener,调用方负责在退出前 stop()
+    """
+    import logging
+    import logging.handlers
+    import queue
+
+    log_queue: "queue.Queue" = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+
+    pkg_logger = logging.getLogger("rungpt")
+    pkg_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    pkg_logger.setLevel(logging.INFO if level is None else level)
+    return listener
+
+
+def truncate(text: str, limit: int = 100, ellipsis: str = "...") -> str:
+    """
+    截断文本用于预览显示
+
+    单次分支、至多一次分配,替代散落各处的
+    `s[:n] + "..." if len(s) > n else s` 写法。
+
+    Args:
+        text: 原始文本
+        limit: 最大保留长度
+        ellipsis: 截断后缀
+
+    Returns:
+        截断后的文本
+    """
+    return text if len(text) <= limit else f"{text[:limit]}{ellipsis}"
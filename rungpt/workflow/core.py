@@ -5,6 +5,7 @@ Workflow Core Abstractions
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional, Union, Callable
 from dataclasses import dataclass, field
+from ..utils import run_in_thread
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,6 +30,10 @@ class WorkflowContext(dict):
         """合并其他字典到上下文"""
         self.update(other)
 
+    def clone_shallow(self) -> "WorkflowContext":
+        """浅拷贝上下文（供并行分支各自写入,避免线程间竞争同一个 dict）"""
+        return WorkflowContext(self)
+
 
 class Step(ABC):
     """
@@ -52,6 +57,16 @@ class Step(ABC):
         """
         pass
 
+    async def arun(self, context: WorkflowContext) -> Any:
+        """
+        异步执行步骤
+
+        默认实现把同步 run() 卸载到工作线程(run_in_thread 兼容 3.8,
+        见 utils),使任意 Step 都能参与 asyncio.gather 编排;
+        原生协程 Step 可重写此方法。
+        """
+        return await run_in_thread(self.run, context)
+
     def __call__(self, context: WorkflowContext) -> Any:
         """允许像函数一样调用 Step"""
         return self.run(context)
@@ -81,16 +96,16 @@ class Pipeline(Step):
         if not isinstance(context, WorkflowContext):
             context = WorkflowContext(context)
         
-        logger.info(f"[{self.name}] Started with context keys: {list(context.keys())}")
+        logger.info("[%s] Started with context keys: %s", self.name, list(context.keys()))
         
         last_result = None
         for step in self.steps:
-            logger.info(f"[{self.name}] Running step: {step.name}")
+            logger.info("[%s] Running step: %s", self.name, step.name)
             try:
                 last_result = step.run(context)
             except Exception as e:
-                logger.error(f"[{self.name}] Step '{step.name}' failed: {str(e)}")
+                logger.error("[%s] Step '%s' failed: %s", self.name, step.name, e)
                 raise e
                 
-        logger.info(f"[{self.name}] Finished")
+        logger.info("[%s] Finished", self.name)
         return last_result
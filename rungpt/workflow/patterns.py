@@ -2,14 +2,23 @@
 Workflow Patterns
 提供常用的编排模式,如 Router (路由)、Parallel (并行) 和 PlanExecute (任务分解)。
 """
+import asyncio
+import io
+from collections import deque
 from typing import List, Tuple, Callable, Any, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import json
 import re
+from ..utils import json_dumps, json_loads, run_in_thread
 from .core import Step, WorkflowContext
 from ..agent.agent_base import AgentBase
 from ..threads import Thread
 
+# 模块级预编译:计划解析的每次调用不再查 re 内部缓存
+_JSON_BLOCK_RE = re.compile(r'```json\s*\n(.*?)\n```', re.DOTALL)
+# 回退解析:一次多行扫描提取 "1. xxx" / "- xxx" 形式的任务行
+# (至少 2 个字符,过滤掉编号残渣和空项;中文任务行往往只有几个字)
+_TASK_LINE_RE = re.compile(r'^[ \t]*(?:\d+[\.\)]|[-*])\s+(.{2,})$', re.MULTILINE)
+
 # 路由条件类型: 接收 Context 返回 bool
 Condition = Callable[[WorkflowContext], bool]
 # 路由项: (条件, 步骤)
@@ -75,31 +84,59 @@ class Parallel(Step):
             Dict[step_name, result]
         """
         results = {}
-        
+        base = dict(context)  # 执行前的快照,用于识别各分支的新写入
+
         # 使用线程池并行执行
-        # 注意: 这里共享了 context,需要注意线程安全
-        # 建议 Parallel 中的 Step 只读取 context,不修改 context,或者修改不同的 key
+        # 每个 Step 在独立的浅拷贝上下文中运行,完成后把新增/修改的键合并回主上下文,
+        # 避免多个分支并发写同一个 dict
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_step = {
-                executor.submit(step.run, context): step 
-                for step in self.steps
-            }
-            
-            for future in as_completed(future_to_step):
-                step = future_to_step[future]
+            future_to_branch = {}
+            for step in self.steps:
+                branch = context.clone_shallow()
+                future_to_branch[executor.submit(step.run, branch)] = (step, branch)
+
+            for future in as_completed(future_to_branch):
+                step, branch = future_to_branch[future]
                 try:
-                    result = future.result()
-                    results[step.name] = result
+                    results[step.name] = future.result()
+                    self._merge_branch(context, branch, base)
                 except Exception as e:
                     results[step.name] = f"Error: {str(e)}"
                     # 也可以选择抛出异常终止整个 Parallel
                     # raise e
-        
+
+        return results
+
+    async def arun(self, context: WorkflowContext) -> Dict[str, Any]:
+        """异步并行执行所有步骤（在事件循环中用 asyncio.gather 并发等待）"""
+        results = {}
+        base = dict(context)
+        branches = [context.clone_shallow() for _ in self.steps]
+        outcomes = await asyncio.gather(
+            *[step.arun(branch) for step, branch in zip(self.steps, branches)],
+            return_exceptions=True
+        )
+        for step, branch, outcome in zip(self.steps, branches, outcomes):
+            if isinstance(outcome, Exception):
+                results[step.name] = f"Error: {str(outcome)}"
+            else:
+                results[step.name] = outcome
+                self._merge_branch(context, branch, base)
         return results
 
+    def _merge_branch(
+        self, context: WorkflowContext, branch: WorkflowContext, base: Dict[str, Any]
+    ) -> None:
+        """把分支上下文中新增或修改的键合并回主上下文"""
+        for key, value in branch.items():
+            if key not in base or base[key] is not value:
+                context[key] = value
+
 
 class Task:
     """子任务"""
+
+    __slots__ = ("id", "description", "dependencies", "status", "result")
     
     def __init__(self, task_id: str, description: str, dependencies: List[str] = None):
         self.id = task_id
@@ -139,6 +176,9 @@ class PlanExecutePattern(Step):
         executor: AgentBase,
         summarizer: AgentBase,
         max_iterations: int = 20,
+        max_workers: int = 5,
+        plan_cache=None,
+        fuse_simple_goals: bool = False,
         name: str = "PlanExecute"
     ):
         """
@@ -149,6 +189,11 @@ class PlanExecutePattern(Step):
             executor: 执行 Agent (执行单个子任务)
             summarizer: 总结 Agent (汇总所有结果)
             max_iterations: 最大执行迭代次数 (防止循环依赖死锁)
+            max_workers: 同一批就绪任务的最大并发执行数
+            plan_cache: 计划模板缓存（可选，ResponseCache 实例。相同目标
+                复用已生成的任务分解模板,省去一次规划 LLM 调用）
+            fuse_simple_goals: 简单目标融合（可选。执行器无工具且目标足够短时,
+                规划/执行/总结合并为一次结构化调用,3 次往返降为 1 次）
             name: 步骤名称
         """
         super().__init__(name)
@@ -156,6 +201,9 @@ class PlanExecutePattern(Step):
         self.executor = executor
         self.summarizer = summarizer
         self.max_iterations = max_iterations
+        self.max_workers = max_workers
+        self.plan_cache = plan_cache
+        self.fuse_simple_goals = fuse_simple_goals
     
     def run(self, context: WorkflowContext) -> Any:
         """
@@ -173,10 +221,20 @@ class PlanExecutePattern(Step):
         if not task:
             raise ValueError("PlanExecutePattern requires 'task' in context")
         
+        # 融合快路径:简单目标用一次结构化调用完成规划+执行+总结
+        if self._should_fuse(task):
+            fused = self._fused_run(task, context)
+            if fused is not None:
+                return fused
+        
         # Phase 1: Planning
         tasks = self._planning_phase(task, context)
         context["plan"] = [t.to_dict() for t in tasks]
         
+        # 计划退化为单个无依赖任务时直接执行:跳过调度循环与总结调用
+        if len(tasks) == 1 and not tasks[0].dependencies:
+            return self._run_single_task(tasks[0], context)
+        
         # Phase 2: Execution
         self._execution_phase(tasks, context)
         context["task_results"] = {t.id: t.result for t in tasks}
@@ -186,6 +244,50 @@ class PlanExecutePattern(Step):
         context["result"] = final_result
         
         return final_result
+
+    async def arun(self, context: WorkflowContext) -> Any:
+        """
+        异步执行 Plan-Execute 循环
+
+        规划/总结阶段卸载到工作线程(run_in_thread 兼容 3.8,见 utils);
+        执行阶段改用 asyncio.gather 并发等待同批就绪任务,
+        事件循环内不再嵌套线程池。
+        """
+        task = context.get("task")
+        if not task:
+            raise ValueError("PlanExecutePattern requires 'task' in context")
+
+        tasks = await run_in_thread(self._planning_phase, task, context)
+        context["plan"] = [t.to_dict() for t in tasks]
+
+        if len(tasks) == 1 and not tasks[0].dependencies:
+            return await run_in_thread(self._run_single_task, tasks[0], context)
+
+        await self._execution_phase_async(tasks, context)
+        context["task_results"] = {t.id: t.result for t in tasks}
+
+        final_result = await run_in_thread(self._summarize_phase, tasks, context)
+        context["result"] = final_result
+        return final_result
+
+    async def _execution_phase_async(self, tasks: List[Task], context: WorkflowContext):
+        """执行阶段的异步版本:同批就绪任务 gather 并发,信号量限流"""
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run_one(task: Task):
+            async with semaphore:
+                # 模型层是同步 HTTP 客户端,单个子任务仍卸载到工作线程
+                await run_in_thread(self._execute_task, task, task_by_id, context)
+
+        task_by_id, successors, indegree, ready = self._build_dependency_index(tasks)
+        iteration = 0
+        while ready and iteration < self.max_iterations:
+            iteration += 1
+            wave = [task_by_id[ready.popleft()] for _ in range(len(ready))]
+            await asyncio.gather(*(run_one(t) for t in wave))
+            for task in wave:
+                if task.status == "completed":
+                    self._release_successors(task, successors, indegree, ready)
     
     def _planning_phase(self, task: str, context: WorkflowContext) -> List[Task]:
         """规划阶段: 分解任务"""
@@ -206,30 +308,113 @@ class PlanExecutePattern(Step):
 - dependencies 是任务 ID 列表
 - 确保依赖关系正确,不要循环依赖
 """
+        # 查询计划模板缓存:同一目标不重复做任务分解
+        cache_key = None
+        if self.plan_cache is not None:
+            cache_key = self.plan_cache.make_key(
+                "plan_template", [{"role": "user", "content": task.strip()}], {}
+            )
+            cached = self.plan_cache.get(cache_key)
+            if cached is not None:
+                return self._tasks_from_template(cached)
+
         # 使用独立的 Thread
         thread = Thread()
         response = self.planner.run(planning_prompt, thread)
         
         # 解析 JSON
         tasks = self._parse_plan(response)
+        if cache_key is not None:
+            self.plan_cache.set(cache_key, self._tasks_to_template(tasks))
         return tasks
+
+    @staticmethod
+    def _tasks_from_template(template: str) -> List[Task]:
+        """从序列化模板重建任务列表(status/result 随 Task 构造重置)"""
+        return [
+            Task(t["id"], t["description"], t.get("dependencies", []))
+            for t in json_loads(template)
+        ]
+
+    @staticmethod
+    def _tasks_to_template(tasks: List[Task]) -> str:
+        """序列化任务结构为模板(只保留 id/描述/依赖,剥离执行状态)"""
+        return json_dumps(
+            [{"id": t.id, "description": t.description, "dependencies": t.dependencies}
+             for t in tasks]
+        )
     
+    def _run_single_task(self, task: Task, context: WorkflowContext) -> str:
+        """单任务快路径:结果即最终答案,省去一次总结 LLM 调用"""
+        self._execute_task(task, {task.id: task}, context)
+        context["task_results"] = {task.id: task.result}
+        result = task.result or ""
+        context["result"] = result
+        return result
+
+    def _should_fuse(self, task: str) -> bool:
+        """是否走融合快路径:显式开启、目标足够短、执行器不依赖工具"""
+        if not self.fuse_simple_goals or len(task) > 120:
+            return False
+        tools = getattr(self.executor, "tools", None)
+        return tools is None or not tools.list_tools()
+
+    def _fused_run(self, task: str, context: WorkflowContext) -> Optional[str]:
+        """融合快路径:一次调用产出计划、各步结果与最终答案
+
+        解析失败返回 None,调用方回退到标准三阶段流程。
+        """
+        prompt = f"""
+请完成以下任务:先在内部拆解步骤,再逐步执行,最后输出 JSON:
+
+{{
+  "tasks": [{{"id": "task_1", "description": "步骤描述", "dependencies": []}}],
+  "results": {{"task_1": "该步骤的结果"}},
+  "final_answer": "最终答案"
+}}
+
+任务: {task}
+"""
+        response = self.planner.run(prompt, Thread())
+        try:
+            data = json_loads(self._extract_json(response))
+            final_answer = data["final_answer"]
+        except (ValueError, KeyError, TypeError):
+            return None
+        
+        tasks = self._parse_tasks(data.get("tasks", []))
+        context["plan"] = [t.to_dict() for t in tasks]
+        context["task_results"] = data.get("results", {})
+        context["result"] = final_answer
+        return final_answer
+
     def _execution_phase(self, tasks: List[Task], context: WorkflowContext):
-        """执行阶段: 按依赖顺序执行任务"""
+        """执行阶段: 按依赖顺序执行任务(Kahn 式就绪队列增量调度)"""
+        task_by_id, successors, indegree, ready = self._build_dependency_index(tasks)
         iteration = 0
         
-        while not self._all_completed(tasks) and iteration < self.max_iterations:
-            iteration += 1
-            ready_tasks = self._get_ready_tasks(tasks)
-            
-            if not ready_tasks:
-                # 没有可执行任务,可能是循环依赖或全部失败
-                break
-            
-            for task in ready_tasks:
-                self._execute_task(task, tasks, context)
+        # 线程池对整个执行阶段复用:多层依赖图不再每波重建/销毁工作线程
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while ready and iteration < self.max_iterations:
+                iteration += 1
+                wave = [task_by_id[ready.popleft()] for _ in range(len(ready))]
+                
+                # 同一批就绪任务的依赖都已满足,相互独立,可以并行执行
+                # 总耗时由依赖图的深度决定,而非任务总数
+                futures = [
+                    executor.submit(self._execute_task, task, task_by_id, context)
+                    for task in wave
+                ]
+                for future in futures:
+                    future.result()
+                
+                # 成功任务释放后继:入度归零的任务进入就绪队列
+                # (失败任务不释放,其下游保持 pending,与原全量扫描语义一致)
+                for task in wave:
+                    if task.status == "completed":
+                        self._release_successors(task, successors, indegree, ready)
     
-    def _execute_task(self, task: Task, all_tasks: List[Task], context: WorkflowContext):
+    def _execute_task(self, task: Task, task_by_id: Dict[str, Task], context: WorkflowContext):
         """执行单个子任务"""
         task.status = "running"
         
@@ -239,7 +424,7 @@ class PlanExecutePattern(Step):
         if task.dependencies:
             prompt_parts.append("\n前置任务结果:")
             for dep_id in task.dependencies:
-                dep_task = self._get_task_by_id(all_tasks, dep_id)
+                dep_task = task_by_id.get(dep_id)
                 if dep_task and dep_task.result:
                     prompt_parts.append(f"- [{dep_id}]: {dep_task.result}")
         
@@ -256,22 +441,25 @@ class PlanExecutePattern(Step):
             task.status = "failed"
     
     def _summarize_phase(self, tasks: List[Task], context: WorkflowContext) -> str:
-        """总结阶段: 汇总结果"""
-        summary_parts = ["以下是所有子任务的执行结果:\n"]
+        """总结阶段: 汇总结果(写入单一增长缓冲,免去中间小字符串列表)"""
+        buf = io.StringIO()
+        buf.write("以下是所有子任务的执行结果:\n\n")
         
         for task in tasks:
-            summary_parts.append(f"[{task.id}] {task.description}")
-            summary_parts.append(f"  状态: {task.status}")
+            buf.write(f"[{task.id}] {task.description}\n")
+            buf.write(f"  状态: {task.status}\n")
             if task.result:
-                summary_parts.append(f"  结果: {task.result[:200]}...")
-            summary_parts.append("")
-        
-        summary_parts.append("请基于以上结果,给出最终的总结和答案。")
+                # 短结果原样写入,不做切片拷贝
+                result = task.result if len(task.result) <= 200 else task.result[:200]
+                buf.write("  结果: ")
+                buf.write(result)
+                buf.write("...\n")
+            buf.write("\n")
         
-        summary_prompt = "\n".join(summary_parts)
+        buf.write("请基于以上结果,给出最终的总结和答案。")
         
         thread = Thread()
-        final_result = self.summarizer.run(summary_prompt, thread)
+        final_result = self.summarizer.run(buf.getvalue(), thread)
         return final_result
     
     # ========================================
@@ -279,52 +467,96 @@ class PlanExecutePattern(Step):
     # ========================================
     
     def _parse_plan(self, response: str) -> List[Task]:
-        """解析 JSON 任务列表"""
-        # 尝试提取 JSON 代码块
-        json_match = re.search(r'```json\s*\n(.*?)\n```', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            json_str = response.strip()
-        
+        """解析 JSON 任务列表(JSON 失败时回退提取编号/符号列表行)"""
         try:
-            data = json.loads(json_str)
-            task_list = data.get("tasks", [])
-            
-            tasks = []
-            for t_data in task_list:
-                task = Task(
-                    task_id=t_data["id"],
-                    description=t_data["description"],
-                    dependencies=t_data.get("dependencies", [])
-                )
-                tasks.append(task)
-            
-            return tasks
+            data = json_loads(self._extract_json(response))
+            return self._parse_tasks(data.get("tasks", []))
         except Exception as e:
+            tasks = self._fallback_parse(response)
+            if tasks:
+                return tasks
             raise ValueError(f"无法解析任务计划: {e}\n原始响应: {response}")
+
+    @staticmethod
+    def _fallback_parse(response: str) -> List[Task]:
+        """从纯文本列表行提取无依赖任务(单次 C 级多行正则扫描)"""
+        return [
+            Task(f"task_{i + 1}", line.strip(), [])
+            for i, line in enumerate(_TASK_LINE_RE.findall(response))
+        ]
+
+    @staticmethod
+    def _extract_json(response: str) -> str:
+        """提取响应中的 JSON 文本(优先 ```json 代码块)"""
+        json_match = _JSON_BLOCK_RE.search(response)
+        if json_match:
+            return json_match.group(1)
+        return response.strip()
+
+    @staticmethod
+    def _parse_tasks(task_list: List[Dict[str, Any]]) -> List[Task]:
+        """把任务字典列表转换为 Task 对象"""
+        return [
+            Task(
+                task_id=t_data["id"],
+                description=t_data["description"],
+                dependencies=t_data.get("dependencies", [])
+            )
+            for t_data in task_list
+        ]
     
-    def _get_ready_tasks(self, tasks: List[Task]) -> List[Task]:
-        """获取可执行的任务（依赖已完成）"""
-        ready = []
-        for task in tasks:
-            if task.status == "pending":
-                deps_completed = all(
-                    self._get_task_by_id(tasks, dep_id).status == "completed"
-                    for dep_id in task.dependencies
-                )
-                if deps_completed:
-                    ready.append(task)
-        return ready
-    
-    def _get_task_by_id(self, tasks: List[Task], task_id: str) -> Optional[Task]:
-        """根据 ID 查找任务"""
+    def _build_dependency_index(self, tasks: List[Task]):
+        """预计算依赖图索引: (id->任务, 后继表, 入度表, 初始就绪队列)
+
+        每次任务完成只需对其后继做 O(1) 的入度递减,
+        取代每轮对全部任务×全部依赖的就绪扫描。
+        未知的依赖 ID 保持入度不归零,对应任务停留在 pending。
+        """
+        task_by_id = {t.id: t for t in tasks}
+        successors: Dict[str, List[str]] = {t.id: [] for t in tasks}
+        indegree: Dict[str, int] = {}
         for task in tasks:
-            if task.id == task_id:
-                return task
-        return None
+            indegree[task.id] = len(task.dependencies)
+            for dep_id in task.dependencies:
+                if dep_id in successors:
+                    successors[dep_id].append(task.id)
+        ready = deque(t.id for t in tasks if indegree[t.id] == 0)
+        self._detect_cycles(task_by_id, successors)
+        return task_by_id, successors, indegree, ready
+
+    @staticmethod
+    def _detect_cycles(task_by_id: Dict[str, Task], successors: Dict[str, List[str]]) -> None:
+        """构建期检测循环依赖
+
+        只统计已知任务间的依赖做一次模拟消解(未知依赖视为已满足,
+        对应任务保持 pending 的语义不变);消解后仍有剩余入度的任务
+        必然在环上或被环阻塞,直接报错而非静默留在 pending。
+        """
+        sim = {
+            t.id: sum(1 for d in t.dependencies if d in task_by_id)
+            for t in task_by_id.values()
+        }
+        queue = deque(tid for tid, deg in sim.items() if deg == 0)
+        while queue:
+            for succ in successors[queue.popleft()]:
+                sim[succ] -= 1
+                if sim[succ] == 0:
+                    queue.append(succ)
+        cyclic = [tid for tid, deg in sim.items() if deg > 0]
+        if cyclic:
+            raise ValueError(f"任务计划存在循环依赖,涉及任务: {cyclic}")
     
-    def _all_completed(self, tasks: List[Task]) -> bool:
-        """检查是否所有任务已完成"""
-        return all(t.status in ["completed", "failed"] for t in tasks)
+    @staticmethod
+    def _release_successors(
+        task: Task,
+        successors: Dict[str, List[str]],
+        indegree: Dict[str, int],
+        ready: deque
+    ) -> None:
+        """任务完成后递减后继入度,归零的进入就绪队列"""
+        for succ_id in successors[task.id]:
+            indegree[succ_id] -= 1
+            if indegree[succ_id] == 0:
+                ready.append(succ_id)
+
 
@@ -2,7 +2,8 @@
 Standard Workflow Steps
 提供常用的 Step 实现,包括 AgentStep (包装 Agent) 和 FunctionStep (包装函数)。
 """
-from typing import Any, Callable, Optional, Dict, Union
+import re
+from typing import Any, Callable, List, Optional, Dict, Union
 from .core import Step, WorkflowContext
 from ..agent.agent_base import AgentBase
 from ..threads import Thread
@@ -19,23 +20,26 @@ class AgentStep(Step):
         name: str,
         input_key: str = "task",
         output_key: str = "result",
-        input_template: Optional[str] = None
+        input_template: Optional[str] = None,
+        cache: bool = False
     ):
         """
         初始化 AgentStep
-        
+
         Args:
             agent: RunGPT Agent 实例
             name: 步骤名称
             input_key: 从 Context 中读取输入的键名 (默认 "task")
             output_key: 将结果写入 Context 的键名 (默认 "result")
             input_template: 输入模板 (例如 "请分析: {query}"),如果提供则忽略 input_key 直接使用模板渲染
+            cache: 是否在 Context 中按 (步骤名, 输入) 记忆结果,重复运行同一 Context 时跳过 Agent 调用
         """
         super().__init__(name)
         self.agent = agent
         self.input_key = input_key
         self.output_key = output_key
         self.input_template = input_template
+        self.cache = cache
 
     def run(self, context: WorkflowContext) -> Any:
         # 1. 准备输入
@@ -51,16 +55,28 @@ class AgentStep(Step):
             if task_input is None:
                 raise ValueError(f"AgentStep '{self.name}' missing input key: '{self.input_key}'")
 
-        # 2. 准备 Thread (每个 Step 使用独立的 Thread,或者从 Context 获取共享 Thread)
+        # 2. 查询步骤级缓存:同一 Context 上重复运行时直接复用结果
+        cache_key = None
+        if self.cache:
+            step_cache = context.setdefault("_step_cache", {})
+            cache_key = (self.name, task_input)
+            if cache_key in step_cache:
+                result = step_cache[cache_key]
+                context[self.output_key] = result
+                return result
+
+        # 3. 准备 Thread (每个 Step 使用独立的 Thread,或者从 Context 获取共享 Thread)
         # 目前策略: 每次创建新 Thread 以保持无状态,除非 Context 中显式传递了 thread
         thread = context.get("thread", Thread())
 
-        # 3. 执行 Agent
+        # 4. 执行 Agent
         result = self.agent.run(task_input, thread)
 
-        # 4. 写入输出
+        # 5. 写入输出
         context[self.output_key] = result
-        
+        if cache_key is not None:
+            context["_step_cache"][cache_key] = result
+
         return result
 
 
@@ -87,3 +103,38 @@ class FunctionStep(Step):
 
     def run(self, context: WorkflowContext) -> Any:
         return self.func(context)
+
+    @classmethod
+    def from_keywords(
+        cls,
+        keywords: List[str],
+        input_key: str = "query",
+        output_key: str = "matched",
+        threshold: int = 1,
+        name: str = "KeywordMatch"
+    ) -> "FunctionStep":
+        """
+        构建关键词匹配步骤（常用于 Router 的分类前置步骤）
+
+        关键词在构建时预编译为单个正则,每次匹配只做一趟 C 级扫描,
+        成本不随关键词数量线性增长。
+
+        Args:
+            keywords: 关键词列表
+            input_key: 从 Context 读取待匹配文本的键名
+            output_key: 匹配结果（bool）写入 Context 的键名
+            threshold: 命中次数阈值,达到即判定匹配（默认 1）
+            name: 步骤名称
+
+        Returns:
+            FunctionStep 实例
+        """
+        pattern = re.compile("|".join(map(re.escape, keywords)))
+
+        def match(context: WorkflowContext) -> bool:
+            text = context.get(input_key) or ""
+            result = len(pattern.findall(text)) >= threshold
+            context[output_key] = result
+            return result
+
+        return cls(match, name=name)